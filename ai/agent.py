@@ -1,8 +1,45 @@
+from config import settings
+from models.Outcome import MAX_CARDS, OUTCOMES
 import numpy as np
+import zipfile
+import zlib
+import hashlib
 import random
+import json
+import time
 import os
 
 
+# Version of the .npz model container written by QLearningAgent.save
+MODEL_FORMAT_VERSION = 1
+
+Q_TABLE_SHAPE = (32, 12, 6, 2, 2)
+STATE_ENCODING = 'player_value,dealer_showing,num_cards,usable_ace;actions=hit,stand'
+
+# dtypes a Q-table can be stored as, int8 is linearly quantized with a per-table scale
+MODEL_DTYPES = ('float64', 'float32', 'float16', 'int8')
+
+# Players must hit below this value
+MUST_HIT_BELOW = 16
+
+# Step size of Q-value updates: fixed, 1/N or 1/N^power of the (state, action) visit count N
+LR_SCHEDULES = ('constant', 'harmonic', 'polynomial')
+
+# Exploration rate: one epsilon decayed per episode, or per state from its visit count
+EXPLORATION_SCHEDULES = ('decay', 'visits')
+
+
+def rules_fingerprint():
+    """Short hash of the game rules a Q-table is trained for (card values, special cases, must-hit rule)"""
+    rules = json.dumps({
+        'values': settings.values,
+        'max_cards': MAX_CARDS,
+        'outcomes': [[[int(o) for o in row] for row in table] for table in OUTCOMES],
+        'must_hit_below': MUST_HIT_BELOW,
+    }, sort_keys=True)
+    return hashlib.sha1(rules.encode()).hexdigest()[:16]
+
+
 class QLearningAgent:
     """
     Q-Learning agent that learns to play Blackjack
@@ -18,27 +55,69 @@ class QLearningAgent:
     - 1: STAND
     """
     
-    def __init__(self, learning_rate=0.1, discount_factor=0.95, epsilon=1.0, epsilon_decay=0.9995, epsilon_min=0.01):
+    def __init__(self, learning_rate=0.1, discount_factor=0.95, epsilon=1.0, epsilon_decay=0.9995, epsilon_min=0.01,
+                 lr_schedule='constant', lr_power=0.8, exploration='decay', exploration_constant=100):
         """
         Initialize the Q-learning agent
         
         Args:
-            learning_rate (float): Learning rate (alpha)
+            learning_rate (float): Learning rate (alpha) of the constant schedule
             discount_factor (float): Discount factor (gamma)
             epsilon (float): Exploration rate
             epsilon_decay (float): Epsilon decay rate per episode
             epsilon_min (float): Minimum epsilon value
+            lr_schedule (str): One of LR_SCHEDULES, 'harmonic' and 'polynomial' give every
+                (state, action) its own learning rate 1/N or 1/N^lr_power
+            lr_power (float): Exponent of the polynomial schedule, in (0.5, 1]
+            exploration (str): One of EXPLORATION_SCHEDULES, 'visits' explores each state with
+                epsilon = exploration_constant / (exploration_constant + N(s)), at least epsilon_min
+            exploration_constant (float): Visits after which a state is explored half the time
         """
+        if lr_schedule not in LR_SCHEDULES:
+            raise ValueError(f"Unknown learning rate schedule {lr_schedule}, expected one of {LR_SCHEDULES}")
+        if exploration not in EXPLORATION_SCHEDULES:
+            raise ValueError(f"Unknown exploration schedule {exploration}, expected one of {EXPLORATION_SCHEDULES}")
+        
         self.lr = learning_rate
         self.gamma = discount_factor
         self.epsilon = epsilon
         self.epsilon_decay = epsilon_decay
         self.epsilon_min = epsilon_min
+        self.lr_schedule = lr_schedule
+        self.lr_power = lr_power
+        self.exploration = exploration
+        self.exploration_constant = exploration_constant
         
         # Initialize Q-table: state -> [Q(s,HIT), Q(s,STAND)]
         # State dimensions: [player_value, dealer_showing, num_cards, usable_ace]
-        self.q_table = np.zeros((32, 12, 6, 2, 2))
+        self.q_table = np.zeros(Q_TABLE_SHAPE)
+        # Number of updates of each (state, action), drives the adaptive schedules
+        self.visits = np.zeros(Q_TABLE_SHAPE, dtype=np.int64)
+        
+        # Greedy action per state, compiled from the Q-table on demand
+        self.greedy_policy = None
+        
+        # File the Q-table was loaded from, for reload_if_changed
+        self.model_path = None
+        self.model_mmap = False
+        self._model_stat = None
+        # Header of the loaded .npz model, None for a raw .npy table
+        self.model_info = None
         
+    @staticmethod
+    def state_index(state):
+        """
+        Clamp a state to the Q-table bounds
+        
+        Args:
+            state (tuple): (player_value, dealer_showing, player_num_cards, usable_ace)
+            
+        Returns:
+            tuple: Index of the state in the Q-table
+        """
+        player_value, dealer_showing, num_cards, usable_ace = state
+        return (max(0, min(31, player_value)), max(0, min(11, dealer_showing)), max(0, min(5, num_cards)), int(usable_ace))
+    
     def get_action(self, state, valid_actions=None, training=True):
         """
         Choose an action using epsilon-greedy policy
@@ -51,21 +130,14 @@ class QLearningAgent:
         Returns:
             int: Action to take (0=HIT, 1=STAND)
         """
-        player_value, dealer_showing, num_cards, usable_ace = state
-        
-        player_value = max(0, min(31, player_value))
-        dealer_showing = max(0, min(11, dealer_showing))
-        num_cards = max(0, min(5, num_cards))
-        usable_ace = int(usable_ace)
-        
-        if training and random.random() < self.epsilon:
+        if training and random.random() < self.state_epsilon(state):
             # Explore: random valid action
             if valid_actions:
                 return random.choice(valid_actions)
             return random.randint(0, 1)
         else:
             # Exploit: choose best action from Q-table
-            q_values = self.q_table[player_value, dealer_showing, num_cards, usable_ace]
+            q_values = self.q_table[self.state_index(state)]
             if valid_actions:
                 if len(valid_actions) == 1:
                     return valid_actions[0]
@@ -75,70 +147,308 @@ class QLearningAgent:
             
             return np.argmax(q_values)
     
+    def state_epsilon(self, state):
+        """
+        Exploration rate in a state
+        
+        Args:
+            state (tuple): (player_value, dealer_showing, player_num_cards, usable_ace)
+            
+        Returns:
+            float: The global epsilon, or with exploration='visits' a rate that
+                shrinks as the state is visited
+        """
+        if self.exploration == 'decay':
+            return self.epsilon
+        count = self.visits[self.state_index(state)].sum()
+        return max(self.epsilon_min, self.exploration_constant / (self.exploration_constant + count))
+    
+    def learning_rate(self, count):
+        """
+        Step size of the count-th update of a (state, action)
+        
+        Args:
+            count (int): Visit count including the current update, at least 1
+            
+        Returns:
+            float: Learning rate (alpha)
+        """
+        if self.lr_schedule == 'harmonic':
+            return 1.0 / count
+        if self.lr_schedule == 'polynomial':
+            return count ** -self.lr_power
+        return self.lr
+    
     def update(self, state, action, reward, next_state, done):
         """
         Update Q-table using Q-learning update rule
         
         Q(s,a) = Q(s,a) + alpha * [reward + gamma * max(Q(s',a')) - Q(s,a)]
         
+        alpha follows the learning rate schedule and the visit count of (s,a)
+        is incremented.
+        
         Args:
             state (tuple): Current state
             action (int): Action taken
             reward (float): Reward received
             next_state (tuple): Next state
             done (bool): Whether episode is done
+            
+        Returns:
+            float: Change applied to Q(s,a)
         """
-        player_value, dealer_showing, num_cards, usable_ace = state
-        player_value = max(0, min(31, player_value))
-        dealer_showing = max(0, min(11, dealer_showing))
-        num_cards = max(0, min(5, num_cards))
-        usable_ace = int(usable_ace)
+        index = self.state_index(state) + (action,)
         
         # Current Q-value
-        current_q = self.q_table[player_value, dealer_showing, num_cards, usable_ace, action]
+        current_q = self.q_table[index]
         
         # Calculate target Q-value
         if done:
             target_q = reward
         else:
-            next_player_value, next_dealer_showing, next_num_cards, next_usable_ace = next_state
-            next_player_value = max(0, min(31, next_player_value))
-            next_dealer_showing = max(0, min(11, next_dealer_showing))
-            next_num_cards = max(0, min(5, next_num_cards))
-            next_usable_ace = int(next_usable_ace)
-            
-            max_next_q = np.max(self.q_table[next_player_value, next_dealer_showing, next_num_cards, next_usable_ace])
+            max_next_q = np.max(self.q_table[self.state_index(next_state)])
             target_q = reward + self.gamma * max_next_q
         
         # Update Q-value
-        self.q_table[player_value, dealer_showing, num_cards, usable_ace, action] += self.lr * (target_q - current_q)
+        self.visits[index] += 1
+        delta = self.learning_rate(self.visits[index]) * (target_q - current_q)
+        self.q_table[index] += delta
+        self.greedy_policy = None
+        return delta
+    
+    def compile_policy(self):
+        """
+        Compile the Q-table into a greedy action per state
+        
+        The must-hit rules are baked in: HIT below 16, STAND once the hand
+        has 5 cards or is bust. Ties go to STAND, like get_action with
+        valid_actions [1, 0].
+        
+        Returns:
+            np.ndarray: (32, 12, 6, 2) int8 array of actions (0 = HIT, 1 = STAND)
+        """
+        player_value = np.arange(self.q_table.shape[0])[:, None, None, None]
+        num_cards = np.arange(self.q_table.shape[2])[None, None, :, None]
+        
+        policy = (self.q_table[..., 1] >= self.q_table[..., 0]).astype(np.int8)
+        policy[np.broadcast_to((num_cards >= 5) | (player_value > 21), policy.shape)] = 1
+        policy[np.broadcast_to(player_value < MUST_HIT_BELOW, policy.shape)] = 0
+        self.greedy_policy = policy
+        return policy
+    
+    def act(self, state):
+        """
+        Greedy action for a state, using the compiled policy
+        
+        Args:
+            state (tuple): (player_value, dealer_showing, player_num_cards, usable_ace)
+            
+        Returns:
+            int: Action to take (0=HIT, 1=STAND)
+        """
+        if self.greedy_policy is None:
+            self.compile_policy()
+        return int(self.greedy_policy[self.state_index(state)])
+    
+    def act_batch(self, states):
+        """
+        Greedy actions for a batch of states, using the compiled policy
+        
+        Args:
+            states (np.ndarray): (N, 4) array of (player_value, dealer_showing, player_num_cards, usable_ace)
+            
+        Returns:
+            np.ndarray: (N,) array of actions (0=HIT, 1=STAND)
+        """
+        if self.greedy_policy is None:
+            self.compile_policy()
+        states = np.asarray(states)
+        return self.greedy_policy[
+            np.clip(states[:, 0], 0, 31),
+            np.clip(states[:, 1], 0, 11),
+            np.clip(states[:, 2], 0, 5),
+            states[:, 3].astype(bool).astype(np.intp),
+        ]
     
     def decay_epsilon(self):
         """Decay epsilon after each episode"""
         self.epsilon = max(self.epsilon_min, self.epsilon * self.epsilon_decay)
     
-    def save(self, filepath):
+    def save(self, filepath, dtype='float32', training_stats=None):
         """
         Save Q-table to file
         
+        A path ending in .npz writes a versioned model container: the table in
+        the given dtype, the visit counts, and a header with the state
+        encoding, rules fingerprint, hyperparameters and training stats. Any
+        other path writes the raw float64 table as .npy.
+        
+        The file is written to a temporary file that then replaces filepath,
+        so processes memory-mapping or reloading the model never see a
+        partially written file.
+        
         Args:
             filepath (str): Path to save Q-table
+            dtype (str): Storage dtype of a .npz model, one of MODEL_DTYPES
+            training_stats (dict): JSON-serializable training statistics for the header (optional)
         """
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        np.save(filepath, self.q_table)
+        os.makedirs(os.path.dirname(filepath) or '.', exist_ok=True)
+        tmp_path = f"{filepath}.tmp{os.getpid()}"
+        with open(tmp_path, 'wb') as f:
+            if filepath.endswith('.npz'):
+                np.savez_compressed(f, **self._model_arrays(dtype, training_stats))
+            else:
+                np.save(f, self.q_table)
+        os.replace(tmp_path, filepath)
         print(f"Q-table saved to {filepath}")
     
-    def load(self, filepath):
+    def _model_arrays(self, dtype, training_stats):
+        """Arrays of the .npz model container"""
+        if dtype not in MODEL_DTYPES:
+            raise ValueError(f"Unsupported model dtype {dtype}, expected one of {MODEL_DTYPES}")
+        
+        arrays = {}
+        scale = 1.0
+        if dtype == 'int8':
+            scale = float(np.abs(self.q_table).max()) / 127 or 1.0
+            arrays['q_table'] = np.round(self.q_table / scale).astype(np.int8)
+        else:
+            arrays['q_table'] = self.q_table.astype(dtype)
+        arrays['visits'] = np.minimum(self.visits, np.iinfo(np.uint32).max).astype(np.uint32)
+        
+        header = {
+            'format_version': MODEL_FORMAT_VERSION,
+            'shape': list(Q_TABLE_SHAPE),
+            'dtype': dtype,
+            'scale': scale,
+            'state_encoding': STATE_ENCODING,
+            'rules': rules_fingerprint(),
+            'hyperparameters': {
+                'learning_rate': self.lr,
+                'discount_factor': self.gamma,
+                'epsilon': self.epsilon,
+                'epsilon_decay': self.epsilon_decay,
+                'epsilon_min': self.epsilon_min,
+                'lr_schedule': self.lr_schedule,
+                'lr_power': self.lr_power,
+                'exploration': self.exploration,
+                'exploration_constant': self.exploration_constant,
+            },
+            'training_stats': training_stats or {},
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        }
+        arrays['header'] = np.array(json.dumps(header))
+        return arrays
+    
+    @staticmethod
+    def _read_model(filepath):
+        """
+        Read and validate a .npz model container
+        
+        Returns:
+            tuple: (float64 Q-table, visit counts (zeros if not stored), header dict)
+            
+        Raises:
+            ValueError: If the file is truncated or corrupt, or the model was written for another
+                format version, state layout or rule set
+        """
+        try:
+            return QLearningAgent._read_model_container(filepath)
+        except (OSError, EOFError, KeyError, zipfile.BadZipFile, zlib.error) as e:
+            # Truncated or corrupt files are rejected like invalid models
+            raise ValueError(f"{filepath} is not a readable model: {e}") from e
+    
+    @staticmethod
+    def _read_model_container(filepath):
+        with np.load(filepath) as data:
+            if 'header' not in data.files or 'q_table' not in data.files:
+                raise ValueError(f"{filepath} is not a Q-learning model (missing header or q_table)")
+            header = json.loads(str(data['header']))
+            if header.get('format_version', 0) > MODEL_FORMAT_VERSION:
+                raise ValueError(f"{filepath} has model format version {header.get('format_version')}, "
+                                 f"this version reads up to {MODEL_FORMAT_VERSION}")
+            if tuple(header.get('shape', ())) != Q_TABLE_SHAPE or data['q_table'].shape != Q_TABLE_SHAPE:
+                raise ValueError(f"{filepath} has Q-table shape {tuple(header.get('shape', ()))}, expected {Q_TABLE_SHAPE}")
+            if header.get('state_encoding') != STATE_ENCODING:
+                raise ValueError(f"{filepath} uses state encoding {header.get('state_encoding')!r}, expected {STATE_ENCODING!r}")
+            if header.get('rules') != rules_fingerprint():
+                raise ValueError(f"{filepath} was trained for different game rules "
+                                 f"(fingerprint {header.get('rules')}, expected {rules_fingerprint()})")
+            
+            q_table = data['q_table'].astype(np.float64) * header.get('scale', 1.0)
+            visits = data['visits'].astype(np.int64) if 'visits' in data.files else np.zeros(Q_TABLE_SHAPE, dtype=np.int64)
+        return q_table, visits, header
+    
+    def load(self, filepath, mmap=False):
         """
         Load Q-table from file
         
         Args:
-            filepath (str): Path to load Q-table from
+            filepath (str): Path to load Q-table from, a .npz model or a raw .npy table
+            mmap (bool): Memory-map a .npy table read-only instead of reading a private copy,
+                so every process using the model shares one physical copy. The Q-table
+                then cannot be updated (inference only). .npz models are small enough
+                to always be read.
+            
+        Returns:
+            bool: True if the Q-table was loaded
+            
+        Raises:
+            ValueError: If the file is truncated or corrupt, or holds a table for another state
+                layout or rule set
         """
         if os.path.exists(filepath):
-            self.q_table = np.load(filepath)
+            if filepath.endswith('.npz'):
+                q_table, self.visits, self.model_info = self._read_model(filepath)
+            else:
+                try:
+                    q_table = np.load(filepath, mmap_mode='r' if mmap else None)
+                except (OSError, EOFError) as e:
+                    raise ValueError(f"{filepath} is not a readable Q-table: {e}") from e
+                if q_table.shape != Q_TABLE_SHAPE:
+                    raise ValueError(f"{filepath} has Q-table shape {q_table.shape}, expected {Q_TABLE_SHAPE}")
+                # Raw tables carry no visit counts, adaptive schedules restart from zero
+                self.visits, self.model_info = np.zeros(Q_TABLE_SHAPE, dtype=np.int64), None
+            self.q_table = q_table
+            self.compile_policy()
+            self.model_path = filepath
+            self.model_mmap = mmap
+            self._model_stat = self._file_stat(filepath)
             print(f"Q-table loaded from {filepath}")
             return True
         else:
             print(f"No Q-table found at {filepath}")
             return False
+    
+    @staticmethod
+    def _file_stat(filepath):
+        """Identity of a file version: replacing the file changes its inode or mtime"""
+        st = os.stat(filepath)
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+    
+    def reload_if_changed(self):
+        """
+        Reload the Q-table if its file was replaced since it was loaded
+        
+        Meant for files replaced atomically (see save), which lets a new model
+        roll out to running processes without restarting them. A replacement
+        that fails validation is reported once and the current Q-table is kept.
+        
+        Returns:
+            bool: True if a new Q-table was loaded
+        """
+        if self.model_path is None:
+            return False
+        try:
+            stat = self._file_stat(self.model_path)
+        except OSError:
+            return False
+        if stat == self._model_stat:
+            return False
+        try:
+            return self.load(self.model_path, mmap=self.model_mmap)
+        except ValueError as e:
+            print(f"Keeping the current Q-table: {e}")
+            self._model_stat = stat
+            return False
@@ -0,0 +1,238 @@
+import numpy as np
+
+from models.Card import CARDS
+from models.Outcome import OUTCOMES, Outcome, MAX_CARDS
+
+
+# Card values of a single 52-card deck indexed by Card.id (Ace counted as 1)
+DECK_VALUES = np.array([card.value for card in CARDS], dtype=np.int8)
+
+# Outcome lookup table, indexed as OUTCOME_TABLE[num_cards, hard_total, aces]
+OUTCOME_TABLE = np.array(OUTCOMES, dtype=np.int8)
+
+# Most cards dealt from a deck in one hand: up to 5 each for the player and the dealer
+MAX_DEALT = 2 * MAX_CARDS
+
+
+def hand_values(hard, aces, num_cards):
+    """
+    Vectorized version of Hand._cal_value
+
+    Args:
+        hard (np.ndarray): Hand totals with every Ace counted as 1
+        aces (np.ndarray): Number of Aces in each hand
+        num_cards (np.ndarray): Number of cards in each hand
+
+    Returns:
+        np.ndarray: Hand values under the house rules
+    """
+    # A single Ace in a hand of less than 4 cards counts as 11, then 10, then 1
+    soft = (aces == 1) & (num_cards < 4)
+    return np.where(soft & (hard + 10 <= 21), hard + 10,
+                    np.where(soft & (hard + 9 <= 21), hard + 9, hard))
+
+
+def hand_outcomes(hard, aces, num_cards):
+    """
+    Vectorized version of Hand.outcome
+
+    Returns:
+        np.ndarray: Outcome codes of the hands
+    """
+    return OUTCOME_TABLE[num_cards, hard, aces]
+
+
+class BatchBlackjackEnv:
+    """
+    Vectorized Blackjack environment running N independent tables in lockstep
+
+    Every table follows exactly the same rules as BlackjackEnv, but hands are
+    kept as NumPy arrays (hard total, Ace count, number of cards) instead of
+    Card/Hand objects.
+
+    State: (N, 4) array of (player_value, dealer_showing, player_num_cards, usable_ace)
+    Actions: (N,) array, 0 = HIT, 1 = STAND
+    """
+
+    def __init__(self, num_envs, seed=None):
+        """
+        Initialize the batch environment
+
+        Args:
+            num_envs (int): Number of tables simulated in parallel
+            seed (int): Seed for the random generator (optional)
+        """
+        self.num_envs = num_envs
+        self.rng = np.random.default_rng(seed)
+
+        # One deck per table, its first MAX_DEALT cards reshuffled in place on every reset
+        self.decks = np.tile(DECK_VALUES, (num_envs, 1))
+        self.cursor = np.zeros(num_envs, dtype=np.int64)
+
+        self.player_hard = np.zeros(num_envs, dtype=np.int64)
+        self.player_aces = np.zeros(num_envs, dtype=np.int64)
+        self.player_cards = np.zeros(num_envs, dtype=np.int64)
+        self.dealer_hard = np.zeros(num_envs, dtype=np.int64)
+        self.dealer_aces = np.zeros(num_envs, dtype=np.int64)
+        self.dealer_cards = np.zeros(num_envs, dtype=np.int64)
+        self.dealer_showing = np.zeros(num_envs, dtype=np.int64)
+        self.done = np.ones(num_envs, dtype=bool)
+
+    def reset(self):
+        """
+        Reset every table and return the initial states
+
+        Returns:
+            np.ndarray: (N, 4) array of (player_value, dealer_showing, player_num_cards, usable_ace)
+        """
+        # Partial Fisher-Yates shuffle: only the cards that can be dealt need a
+        # uniformly random order, which is much cheaper than permuting all 52
+        decks = self.decks
+        rows = np.arange(self.num_envs)
+        for i in range(MAX_DEALT):
+            j = self.rng.integers(i, decks.shape[1], size=self.num_envs)
+            picked = decks[rows, j]
+            decks[rows, j] = decks[:, i]
+            decks[:, i] = picked
+
+        # Same dealing order as BlackjackEnv: player, dealer, player, dealer
+        self.player_hard[:] = decks[:, 0] + decks[:, 2]
+        self.player_aces[:] = (decks[:, 0] == 1).astype(np.int64) + (decks[:, 2] == 1)
+        self.player_cards[:] = 2
+        self.dealer_hard[:] = decks[:, 1] + decks[:, 3]
+        self.dealer_aces[:] = (decks[:, 1] == 1).astype(np.int64) + (decks[:, 3] == 1)
+        self.dealer_cards[:] = 2
+        self.dealer_showing[:] = decks[:, 1]
+        self.cursor[:] = 4
+        self.done[:] = False
+
+        return self._get_state()
+
+    @property
+    def player_value(self):
+        return hand_values(self.player_hard, self.player_aces, self.player_cards)
+
+    @property
+    def dealer_value(self):
+        return hand_values(self.dealer_hard, self.dealer_aces, self.dealer_cards)
+
+    def _get_state(self):
+        """
+        Get current state representation of every table
+
+        Returns:
+            np.ndarray: (N, 4) array of (player_value, dealer_showing, player_num_cards, usable_ace)
+        """
+        player_value = self.player_value
+        usable_ace = (player_value > self.player_hard).astype(np.int64)
+        return np.stack((player_value, self.dealer_showing, self.player_cards, usable_ace), axis=1)
+
+    def _draw(self, idx):
+        """Deal the next card of each selected table's deck"""
+        cards = self.decks[idx, self.cursor[idx]].astype(np.int64)
+        self.cursor[idx] += 1
+        return cards
+
+    def valid_action_mask(self):
+        """
+        Valid actions of every table, using the same rules as training
+
+        Returns:
+            np.ndarray: (N, 2) boolean array, column 0 = HIT, column 1 = STAND
+        """
+        player_value = self.player_value
+        can_stand = player_value >= 16
+        can_hit = ((self.player_cards < 5) & (player_value <= 21)) | ~can_stand
+        return np.stack((can_hit, can_stand), axis=1)
+
+    def step(self, actions):
+        """
+        Take one action on every table that is still playing
+
+        Tables that are already done are left untouched and receive a reward of 0.
+
+        Args:
+            actions (np.ndarray): (N,) array, 0 = HIT, 1 = STAND
+
+        Returns:
+            tuple: (states, rewards, dones)
+                - states: (N, 4) array of new states
+                - rewards: (N,) array (1 = win, 0 = tie, -1 = lose)
+                - dones: (N,) boolean array
+        """
+        if self.done.all():
+            raise Exception("All games are already done. Call reset() to start new games.")
+
+        actions = np.asarray(actions)
+        rewards = np.zeros(self.num_envs, dtype=np.int64)
+        active = ~self.done
+
+        # Player has initial special case - player wins immediately
+        special = active & (hand_outcomes(self.player_hard, self.player_aces, self.player_cards) != Outcome.NONE)
+        rewards[special] = 1
+        self.done |= special
+        active &= ~special
+
+        # ACTION: HIT
+        hit = np.flatnonzero(active & (actions == 0))
+        if hit.size:
+            cards = self._draw(hit)
+            self.player_hard[hit] += cards
+            self.player_aces[hit] += cards == 1
+            self.player_cards[hit] += 1
+
+        # Hands end on STAND, bust or 5 cards
+        player_value = self.player_value
+        finished = active & ((actions != 0) | (player_value > 21) | (self.player_cards >= 5))
+        finished_idx = np.flatnonzero(finished)
+        if finished_idx.size:
+            rewards[finished_idx] = self._play_dealer_and_get_reward(finished_idx, player_value[finished_idx])
+            self.done[finished_idx] = True
+
+        return self._get_state(), rewards, self.done.copy()
+
+    def _play_dealer_and_get_reward(self, idx, player_val):
+        """
+        Let the dealer play on the selected tables and determine the rewards
+        Matches the logic of BlackjackEnv._play_dealer_and_get_reward
+
+        Args:
+            idx (np.ndarray): Indices of the finished tables
+            player_val (np.ndarray): Final player values of those tables
+
+        Returns:
+            np.ndarray: 1 = player wins, 0 = tie, -1 = player loses
+        """
+        player_is_bust = player_val > 21
+        player_has_5_charlie = hand_outcomes(self.player_hard[idx], self.player_aces[idx], self.player_cards[idx]) == Outcome.FIVE_CARD_CHARLIE
+
+        # Dealer has initial special case - dealer wins immediately
+        dealer_special = hand_outcomes(self.dealer_hard[idx], self.dealer_aces[idx], self.dealer_cards[idx]) != Outcome.NONE
+
+        # Dealer hits according to the player's state, at most up to 5 cards
+        while True:
+            dealer_val = hand_values(self.dealer_hard[idx], self.dealer_aces[idx], self.dealer_cards[idx])
+            must_hit = np.where(player_is_bust, dealer_val < 17,
+                                np.where(player_has_5_charlie, dealer_val <= 21, dealer_val <= player_val))
+            must_hit &= ~dealer_special & (self.dealer_cards[idx] < 5)
+            if not must_hit.any():
+                break
+
+            hitting = idx[must_hit]
+            cards = self._draw(hitting)
+            self.dealer_hard[hitting] += cards
+            self.dealer_aces[hitting] += cards == 1
+            self.dealer_cards[hitting] += 1
+
+        dealer_is_bust = dealer_val > 21
+        dealer_has_5_charlie = hand_outcomes(self.dealer_hard[idx], self.dealer_aces[idx], self.dealer_cards[idx]) == Outcome.FIVE_CARD_CHARLIE
+
+        higher = np.sign(player_val - dealer_val)
+        rewards = np.select(
+            [player_is_bust & dealer_is_bust, player_is_bust, dealer_is_bust,
+             player_has_5_charlie & dealer_has_5_charlie, player_has_5_charlie, dealer_has_5_charlie],
+            [0, -1, 1, -higher, 1, -1],
+            default=higher,
+        )
+        rewards[dealer_special] = -1
+        return rewards
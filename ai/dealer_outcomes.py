@@ -0,0 +1,242 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from collections import OrderedDict
+from models.Hand import hand_value
+from models.Outcome import Outcome, classify
+import numpy as np
+import argparse
+import time
+
+
+# Probability of drawing each card value (Ace = 1), assuming an infinite shoe
+CARD_PROBS = tuple((value, (4 if value == 10 else 1) / 13) for value in range(1, 11))
+
+# Fields of an outcome vector, win/tie/lose are from the player's point of view
+OUTCOME_FIELDS = ('win', 'tie', 'lose', 'dealer_bust', 'dealer_charlie')
+
+# Every bust player value makes the dealer play the same way
+BUST_VALUE = 22
+
+# Precomputed table shape: [dealer_hard, dealer_aces, player_value, player_has_5_charlie, field]
+# covering every two-card dealer hand, i.e. the state the dealer starts playing from
+TABLE_SHAPE = (21, 3, BUST_VALUE + 1, 2, len(OUTCOME_FIELDS))
+
+DEFAULT_TABLE_PATH = os.path.join('ai', 'data', 'dealer_outcomes.npy')
+
+
+def add_card(hard, aces, count, value):
+    """Running totals of a hand after drawing a card of the given value"""
+    return hard + value, aces + (value == 1), count + 1
+
+
+class DealerOutcomeCache:
+    """
+    Memoized distribution of the dealer's results
+    Follows the rules of BlackjackEnv._play_dealer_and_get_reward
+
+    Keys are (dealer hand totals, player final value, player special case).
+    Results are kept in a size-bounded LRU cache; an optional precomputed
+    table covering every two-card dealer hand can be loaded from disk.
+    """
+
+    def __init__(self, maxsize=65536, table_path=None):
+        """
+        Args:
+            maxsize (int): Maximum number of entries in the LRU cache
+            table_path (str): Precomputed table to load (optional)
+        """
+        self.maxsize = maxsize
+        self.table = None
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()
+        # At most 10 up cards x 23 player values x 2, no need for a bound
+        self._upcard_cache = {}
+        if table_path is not None:
+            self.load(table_path)
+
+    def lookup(self, dealer_hard, dealer_aces, dealer_count, player_value, player_outcome=Outcome.NONE):
+        """
+        Outcome probabilities once the dealer plays out its hand
+
+        Args:
+            dealer_hard (int): Dealer hand total with every Ace counted as 1
+            dealer_aces (int): Number of Aces in the dealer hand
+            dealer_count (int): Number of cards in the dealer hand
+            player_value (int): Final value of the player hand
+            player_outcome (Outcome): Special case of the final player hand
+
+        Returns:
+            tuple: Probabilities in the order of OUTCOME_FIELDS
+        """
+        player_value = min(player_value, BUST_VALUE)
+        player_has_5_charlie = int(player_outcome == Outcome.FIVE_CARD_CHARLIE)
+
+        if self.table is not None and dealer_count == 2:
+            self.hits += 1
+            return tuple(self.table[dealer_hard, dealer_aces, player_value, player_has_5_charlie])
+
+        key = (dealer_hard, dealer_aces, dealer_count, player_value, player_has_5_charlie)
+        cache = self._cache
+        if key in cache:
+            self.hits += 1
+            cache.move_to_end(key)
+            return cache[key]
+
+        self.misses += 1
+        result = self._compute(*key)
+        cache[key] = result
+        if len(cache) > self.maxsize:
+            cache.popitem(last=False)
+        return result
+
+    def lookup_upcard(self, dealer_showing, player_value, player_outcome=Outcome.NONE):
+        """
+        Outcome probabilities against a dealer up card, averaged over the hole card
+
+        Args:
+            dealer_showing (int): Value of the dealer's up card (Ace = 1)
+            player_value (int): Final value of the player hand
+            player_outcome (Outcome): Special case of the final player hand
+
+        Returns:
+            tuple: Probabilities in the order of OUTCOME_FIELDS
+        """
+        player_value = min(player_value, BUST_VALUE)
+        key = (dealer_showing, player_value, player_outcome == Outcome.FIVE_CARD_CHARLIE)
+        if key in self._upcard_cache:
+            return self._upcard_cache[key]
+
+        totals = [0.0] * len(OUTCOME_FIELDS)
+        for value, prob in CARD_PROBS:
+            hand = add_card(dealer_showing, int(dealer_showing == 1), 1, value)
+            for i, p in enumerate(self.lookup(*hand, player_value, player_outcome)):
+                totals[i] += prob * p
+        result = self._upcard_cache[key] = tuple(totals)
+        return result
+
+    def expected_reward(self, dealer_showing, player_value, player_outcome=Outcome.NONE):
+        """Expected reward (1 = win, 0 = tie, -1 = lose) against a dealer up card"""
+        win, _, lose, _, _ = self.lookup_upcard(dealer_showing, player_value, player_outcome)
+        return win - lose
+
+    def _compute(self, dealer_hard, dealer_aces, dealer_count, player_value, player_has_5_charlie):
+        dealer_special = classify(dealer_count, dealer_hard, dealer_aces)
+
+        # Dealer has initial special case - dealer wins immediately
+        if dealer_count == 2 and dealer_special:
+            return (0.0, 0.0, 1.0, 0.0, 0.0)
+
+        dealer_value = hand_value(dealer_hard, dealer_aces, dealer_count)
+        player_is_bust = player_value > 21
+
+        # Dealer plays based on player's state
+        if dealer_count < 5 and not dealer_special:
+            if player_is_bust:
+                must_hit = dealer_value < 17
+            elif not player_has_5_charlie:
+                must_hit = dealer_value <= player_value
+            else:
+                must_hit = dealer_value <= 21
+
+            if must_hit:
+                player_outcome = Outcome.FIVE_CARD_CHARLIE if player_has_5_charlie else Outcome.NONE
+                totals = [0.0] * len(OUTCOME_FIELDS)
+                for value, prob in CARD_PROBS:
+                    next_hand = add_card(dealer_hard, dealer_aces, dealer_count, value)
+                    for i, p in enumerate(self.lookup(*next_hand, player_value, player_outcome)):
+                        totals[i] += prob * p
+                return tuple(totals)
+
+        dealer_is_bust = dealer_value > 21
+        dealer_has_5_charlie = dealer_special == Outcome.FIVE_CARD_CHARLIE
+
+        if player_is_bust and dealer_is_bust:
+            reward = 0
+        elif player_is_bust:
+            reward = -1
+        elif dealer_is_bust:
+            reward = 1
+        elif player_has_5_charlie and dealer_has_5_charlie:
+            reward = (dealer_value > player_value) - (dealer_value < player_value)
+        elif player_has_5_charlie:
+            reward = 1
+        elif dealer_has_5_charlie:
+            reward = -1
+        else:
+            reward = (player_value > dealer_value) - (player_value < dealer_value)
+
+        return (float(reward == 1), float(reward == 0), float(reward == -1),
+                float(dealer_is_bust), float(dealer_has_5_charlie))
+
+    def precompute(self):
+        """
+        Compute the table for every two-card dealer hand
+
+        Returns:
+            np.ndarray: Table of shape TABLE_SHAPE
+        """
+        table = np.zeros(TABLE_SHAPE)
+        for first in range(1, 11):
+            for second in range(first, 11):
+                hard, aces, count = add_card(*add_card(0, 0, 0, first), second)
+                for player_value in range(BUST_VALUE + 1):
+                    for player_has_5_charlie in (0, 1):
+                        outcome = Outcome.FIVE_CARD_CHARLIE if player_has_5_charlie else Outcome.NONE
+                        table[hard, aces, player_value, player_has_5_charlie] = self.lookup(hard, aces, count, player_value, outcome)
+        self.table = table
+        return table
+
+    def save(self, filepath):
+        """
+        Save the precomputed table, computing it first if needed
+
+        Args:
+            filepath (str): Path to save the table
+        """
+        if self.table is None:
+            self.precompute()
+        os.makedirs(os.path.dirname(filepath) or '.', exist_ok=True)
+        np.save(filepath, self.table)
+        print(f"Dealer outcome table saved to {filepath}")
+
+    def load(self, filepath):
+        """
+        Load a precomputed table
+
+        Args:
+            filepath (str): Path to load the table from
+
+        Returns:
+            bool: True if the table was loaded
+        """
+        if not os.path.exists(filepath):
+            print(f"No dealer outcome table found at {filepath}")
+            return False
+        table = np.load(filepath)
+        if table.shape != TABLE_SHAPE:
+            raise ValueError(f"Dealer outcome table has shape {table.shape}, expected {TABLE_SHAPE}")
+        self.table = table
+        self._upcard_cache.clear()
+        return True
+
+    def clear(self):
+        """Empty the LRU cache"""
+        self._cache.clear()
+        self._upcard_cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute the dealer outcome probability table")
+    parser.add_argument('--output', default=DEFAULT_TABLE_PATH, help="Where to save the table")
+    args = parser.parse_args()
+
+    start_time = time.time()
+    cache = DealerOutcomeCache()
+    cache.precompute()
+    print(f"Computed in {time.time() - start_time:.3f}s")
+    cache.save(args.output)
@@ -4,6 +4,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from models.Deck import Deck
 from models.Hand import Hand
+from models.Outcome import Outcome
 from config import settings
 
 
@@ -15,8 +16,17 @@ class BlackjackEnv:
     Actions: 0 = HIT, 1 = STAND
     """
     
-    def __init__(self):
-        self.deck = Deck()
+    def __init__(self, num_decks=1, penetration=None):
+        """
+        Initialize the environment
+
+        Args:
+            num_decks (int): Number of decks in the shoe (1-8)
+            penetration (float): Fraction of the shoe dealt before reshuffling.
+                If None, the shoe is reshuffled before every episode.
+        """
+        self.reshuffle_every_episode = penetration is None
+        self.deck = Deck(num_decks, penetration if penetration is not None else 1.0)
         self.player_hand = Hand()
         self.dealer_hand = Hand()
         self.done = False
@@ -30,8 +40,8 @@ class BlackjackEnv:
         """
         self.player_hand.clear()
         self.dealer_hand.clear()
-        self.deck = Deck()
-        self.deck.shuffle()
+        if self.reshuffle_every_episode or self.deck.needs_shuffle():
+            self.deck.shuffle()
         self.done = False
         
         self.player_hand.add_card(self.deck.deal())
@@ -48,21 +58,9 @@ class BlackjackEnv:
         Returns:
             tuple: (player_value, dealer_showing, player_num_cards, usable_ace)
         """
-        player_value = self.player_hand.value
-        dealer_showing = settings.values[self.dealer_hand.cards[0].rank]
-        player_num_cards = self.player_hand.num_of_cards()
-        
-        usable_ace = 0
-        num_aces = sum(1 for card in self.player_hand.cards if card.rank == 'Ace')
-        if num_aces > 0:
-            value_aces_as_1 = sum(
-                1 if card.rank == 'Ace' else settings.values[card.rank] 
-                for card in self.player_hand.cards
-            )
-            if player_value > value_aces_as_1:
-                usable_ace = 1
-        
-        return (player_value, dealer_showing, player_num_cards, usable_ace)
+        player_hand = self.player_hand
+        dealer_showing = self.dealer_hand.cards[0].value
+        return (player_hand.value, dealer_showing, player_hand.count, int(player_hand.usable_ace))
     
     def step(self, action):
         """
@@ -82,8 +80,8 @@ class BlackjackEnv:
         
         # Check if player has initial special case
         if self.player_hand.num_of_cards() == 2:
-            player_special = self.player_hand.special_cases()
-            if player_special is not None:
+            player_special = self.player_hand.outcome()
+            if player_special:
                 self.done = True
                 return self._get_state(), 1, self.done
         
@@ -92,7 +90,7 @@ class BlackjackEnv:
             self.player_hand.add_card(self.deck.deal())
             
             # Check for player special cases after hitting
-            player_special = self.player_hand.special_cases()
+            player_special = self.player_hand.outcome()
             
             # Check if player busts
             if self.player_hand.value > 21:
@@ -110,12 +108,12 @@ class BlackjackEnv:
         
         # ACTION: STAND
         else:
-            player_special = self.player_hand.special_cases()
+            player_special = self.player_hand.outcome()
             self.done = True
             reward = self._play_dealer_and_get_reward(player_special_case=player_special)
             return self._get_state(), reward, self.done
     
-    def _play_dealer_and_get_reward(self, player_special_case=None):
+    def _play_dealer_and_get_reward(self, player_special_case=Outcome.NONE):
         """
         Let dealer play and determine the reward
         Matches EXACT logic from Game.py lines 326-414
@@ -123,31 +121,31 @@ class BlackjackEnv:
         Returns:
             int: 1 = player wins, 0 = tie, -1 = player loses
         """
-        dealer_special = self.dealer_hand.special_cases()
+        dealer_special = self.dealer_hand.outcome()
         
         # Dealer has initial special case - dealer wins immediately
-        if dealer_special is not None:
+        if dealer_special:
             return -1
         
         # Dealer plays based on player's state
         if self.player_hand.value > 21:
             while self.dealer_hand.value < 17 and self.dealer_hand.num_of_cards() < 5:
                 self.dealer_hand.add_card(self.deck.deal())
-                dealer_special = self.dealer_hand.special_cases()
+                dealer_special = self.dealer_hand.outcome()
                 if dealer_special:
                     break
         
-        elif player_special_case is None:
+        elif not player_special_case:
             while self.dealer_hand.value <= self.player_hand.value and self.dealer_hand.num_of_cards() < 5:
                 self.dealer_hand.add_card(self.deck.deal())
-                dealer_special = self.dealer_hand.special_cases()
+                dealer_special = self.dealer_hand.outcome()
                 if dealer_special:
                     break
         
         else:
             while not self.dealer_hand.value > 21 and self.dealer_hand.num_of_cards() < 5:
                 self.dealer_hand.add_card(self.deck.deal())
-                dealer_special = self.dealer_hand.special_cases()
+                dealer_special = self.dealer_hand.outcome()
                 if dealer_special:
                     break
         
@@ -157,8 +155,8 @@ class BlackjackEnv:
         player_is_bust = self.player_hand.value > 21
         dealer_is_bust = self.dealer_hand.value > 21
         
-        player_has_5_charlie = player_special_case is not None and '5-Card Charlie' in str(player_special_case)
-        dealer_has_5_charlie = dealer_special is not None and '5-Card Charlie' in str(dealer_special)
+        player_has_5_charlie = player_special_case == Outcome.FIVE_CARD_CHARLIE
+        dealer_has_5_charlie = dealer_special == Outcome.FIVE_CARD_CHARLIE
         
         if player_is_bust and dealer_is_bust:
             return 0
@@ -0,0 +1,306 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai.agent import QLearningAgent, Q_TABLE_SHAPE, MUST_HIT_BELOW
+from ai.batch_env import BatchBlackjackEnv, hand_outcomes
+from models.Outcome import Outcome
+import numpy as np
+import argparse
+import time
+
+
+# Shape of a policy table: one action (0 = HIT, 1 = STAND) per state
+POLICY_SHAPE = Q_TABLE_SHAPE[:-1]
+
+# Normal quantile of the reported 95% confidence intervals
+Z_95 = 1.96
+
+# Net chips won per chip bet: a winning special case pays 2.5x the bet, any other win 2x
+PAYOUT_WIN = 1.0
+PAYOUT_SPECIAL_WIN = 1.5
+
+
+def threshold_policy(stand_on=17):
+    """
+    Policy table that hits until the hand value reaches stand_on
+
+    Args:
+        stand_on (int): Hand value to stand on, the must-hit rule still applies below 16
+
+    Returns:
+        np.ndarray: POLICY_SHAPE int8 array of actions
+    """
+    player_value = np.arange(POLICY_SHAPE[0])[:, None, None, None]
+    return np.broadcast_to(player_value >= max(stand_on, MUST_HIT_BELOW), POLICY_SHAPE).astype(np.int8)
+
+
+def greedy_policy(q_table):
+    """
+    Policy table of a Q-table, with the must-hit rules baked in (see QLearningAgent.compile_policy)
+
+    Args:
+        q_table (np.ndarray): Q-table, learned or exact
+
+    Returns:
+        np.ndarray: POLICY_SHAPE int8 array of actions
+    """
+    agent = QLearningAgent()
+    agent.q_table = q_table
+    return agent.compile_policy()
+
+
+class PolicyResult:
+    """
+    Outcome counts and net payouts of a policy, overall and per starting state
+
+    Starting states are the player's two-card state as dealt, flattened into
+    an index of POLICY_SHAPE.
+    """
+
+    def __init__(self, name):
+        """
+        Args:
+            name (str): Name of the policy in reports
+        """
+        self.name = name
+        size = int(np.prod(POLICY_SHAPE))
+        self.hands = np.zeros(size, dtype=np.int64)
+        self.wins = np.zeros(size, dtype=np.int64)
+        self.ties = np.zeros(size, dtype=np.int64)
+        self.losses = np.zeros(size, dtype=np.int64)
+        self.payout = np.zeros(size)
+        self.payout_sq = np.zeros(size)
+        # Paired difference to the baseline policy played on the same cards
+        self.diff = 0.0
+        self.diff_sq = 0.0
+
+    def record(self, starts, payouts, baseline=None):
+        """
+        Add a batch of finished hands
+
+        Args:
+            starts (np.ndarray): Flattened starting state of each hand
+            payouts (np.ndarray): Net chips won per chip bet of each hand
+            baseline (np.ndarray): Payouts of the baseline policy on the same cards (optional)
+        """
+        size = self.hands.size
+        self.hands += np.bincount(starts, minlength=size)
+        self.wins += np.bincount(starts[payouts > 0], minlength=size)
+        self.ties += np.bincount(starts[payouts == 0], minlength=size)
+        self.losses += np.bincount(starts[payouts < 0], minlength=size)
+        self.payout += np.bincount(starts, weights=payouts, minlength=size)
+        self.payout_sq += np.bincount(starts, weights=payouts ** 2, minlength=size)
+        if baseline is not None:
+            diff = payouts - baseline
+            self.diff += diff.sum()
+            self.diff_sq += (diff ** 2).sum()
+
+    @property
+    def total_hands(self):
+        return int(self.hands.sum())
+
+    def rates(self):
+        """(win, tie, loss) rates over every hand"""
+        hands = max(self.total_hands, 1)
+        return self.wins.sum() / hands, self.ties.sum() / hands, self.losses.sum() / hands
+
+    @staticmethod
+    def _mean_ci(total, total_sq, n):
+        """Mean and 95% confidence half-width from a sum and a sum of squares"""
+        n = np.maximum(n, 1)
+        mean = total / n
+        var = np.maximum(total_sq / n - mean ** 2, 0.0) * n / np.maximum(n - 1, 1)
+        return mean, Z_95 * np.sqrt(var / n)
+
+    def expected_value(self):
+        """
+        Expected net payout per chip bet
+
+        Returns:
+            tuple: (expected value, 95% confidence half-width)
+        """
+        ev, ci = self._mean_ci(self.payout.sum(), self.payout_sq.sum(), self.total_hands)
+        return float(ev), float(ci)
+
+    def difference(self):
+        """
+        Expected value minus the baseline's, on the same cards
+
+        Returns:
+            tuple: (difference, 95% confidence half-width)
+        """
+        diff, ci = self._mean_ci(self.diff, self.diff_sq, self.total_hands)
+        return float(diff), float(ci)
+
+    def per_state(self):
+        """
+        Results of every starting state that was dealt
+
+        Returns:
+            list: Dicts with the state, hands, rates and expected value with its 95% confidence half-width
+        """
+        ev, ci = self._mean_ci(self.payout, self.payout_sq, self.hands)
+        rows = []
+        for index in np.flatnonzero(self.hands):
+            player_value, dealer_showing, num_cards, usable_ace = np.unravel_index(index, POLICY_SHAPE)
+            hands = self.hands[index]
+            rows.append({
+                'policy': self.name,
+                'player_value': int(player_value),
+                'dealer_showing': int(dealer_showing),
+                'num_cards': int(num_cards),
+                'usable_ace': int(usable_ace),
+                'hands': int(hands),
+                'win_rate': self.wins[index] / hands,
+                'tie_rate': self.ties[index] / hands,
+                'loss_rate': self.losses[index] / hands,
+                'ev': float(ev[index]),
+                'ev_ci': float(ci[index]),
+            })
+        return rows
+
+
+def play_batch(env, policy):
+    """
+    Play one hand on every table of a batch environment
+
+    Args:
+        env (BatchBlackjackEnv): Batch environment
+        policy (np.ndarray): POLICY_SHAPE array of actions, invalid actions are replaced by the valid one
+
+    Returns:
+        tuple: (flattened starting states, net payouts per chip bet)
+    """
+    states = env.reset()
+    starts = np.ravel_multi_index(_state_index(states), POLICY_SHAPE)
+    rewards = np.zeros(env.num_envs, dtype=np.int64)
+    rows = np.arange(env.num_envs)
+
+    while not env.done.all():
+        actions = policy[_state_index(states)]
+        valid = env.valid_action_mask()
+        actions = np.where(valid[rows, actions], actions, 1 - actions)
+        states, step_rewards, _ = env.step(actions)
+        rewards += step_rewards
+
+    # Hands are left as they finished, a winning special case pays extra
+    special = hand_outcomes(env.player_hard, env.player_aces, env.player_cards) != Outcome.NONE
+    payouts = np.where(rewards > 0, np.where(special, PAYOUT_SPECIAL_WIN, PAYOUT_WIN), rewards.astype(np.float64))
+    return starts, payouts
+
+
+def _state_index(states):
+    """Clamp a batch of states to the policy table bounds, like QLearningAgent.state_index"""
+    return (np.clip(states[:, 0], 0, POLICY_SHAPE[0] - 1),
+            np.clip(states[:, 1], 0, POLICY_SHAPE[1] - 1),
+            np.clip(states[:, 2], 0, POLICY_SHAPE[2] - 1),
+            states[:, 3].astype(bool).astype(np.intp))
+
+
+def evaluate(policies, num_hands=1000000, batch_size=100000, seed=None):
+    """
+    Monte Carlo evaluation of policy tables, vectorized over batches of hands
+
+    Every policy plays the same shuffled decks (common random numbers), so the
+    differences between policies are measured far more precisely than their
+    individual expected values. The first policy is the baseline of the
+    paired differences.
+
+    Args:
+        policies (dict): Policy name -> POLICY_SHAPE array of actions
+        num_hands (int): Hands played by each policy
+        batch_size (int): Hands simulated at once, bounds the memory use
+        seed (int): Seed of the decks (optional)
+
+    Returns:
+        list: PolicyResult of each policy, in the order given
+    """
+    names = list(policies)
+    results = [PolicyResult(name) for name in names]
+    seeds = np.random.SeedSequence(seed)
+
+    played = 0
+    while played < num_hands:
+        size = min(batch_size, num_hands - played)
+        batch_seed = seeds.spawn(1)[0]
+        baseline = None
+        for name, result in zip(names, results):
+            env = BatchBlackjackEnv(size, seed=batch_seed)
+            starts, payouts = play_batch(env, policies[name])
+            result.record(starts, payouts, baseline)
+            if baseline is None:
+                baseline = payouts
+        played += size
+    return results
+
+
+def print_report(results, elapsed=None):
+    """Print the results of every policy, best expected value first"""
+    print("=" * 78)
+    print("POLICY EVALUATION")
+    print("=" * 78)
+    hands = results[0].total_hands if results else 0
+    timing = f" in {elapsed:.2f}s ({hands * len(results) / max(elapsed, 1e-9):,.0f} hands/sec)" if elapsed else ""
+    print(f"{hands:,} hands per policy{timing}")
+    print("Expected value is the net payout per chip bet, +/- a 95% confidence interval")
+    print()
+    print(f"{'Policy':<24} {'Win':>7} {'Tie':>7} {'Loss':>7} {'EV':>17} {'vs ' + results[0].name:>22}")
+    for result in sorted(results, key=lambda r: r.expected_value()[0], reverse=True):
+        win, tie, loss = result.rates()
+        ev, ci = result.expected_value()
+        diff, diff_ci = result.difference()
+        versus = '-' if result is results[0] else f"{diff:+.4f} +/- {diff_ci:.4f}"
+        print(f"{result.name:<24} {win * 100:6.2f}% {tie * 100:6.2f}% {loss * 100:6.2f}% "
+              f"{ev:+.4f} +/- {ci:.4f} {versus:>22}")
+    print("=" * 78)
+
+
+def save_per_state(results, filepath):
+    """Write the per starting state results of every policy to a CSV file"""
+    os.makedirs(os.path.dirname(filepath) or '.', exist_ok=True)
+    rows = [row for result in results for row in result.per_state()]
+    with open(filepath, 'w') as f:
+        f.write(','.join(rows[0]) + '\n')
+        for row in rows:
+            f.write(','.join(f'{v:.6g}' if isinstance(v, float) else str(v) for v in row.values()) + '\n')
+    print(f"Per starting state results saved to {filepath}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluate Blackjack policy tables over millions of simulated hands")
+    parser.add_argument('--model', action='append', default=[], help="Q-table to evaluate (.npy or .npz), repeatable")
+    parser.add_argument('--threshold', type=int, action='append', default=[],
+                        help="Evaluate 'hit under N', repeatable")
+    parser.add_argument('--exact', action='store_true', help="Also evaluate the exact policy of ai/solver.py")
+    parser.add_argument('--hands', type=int, default=1000000, help="Hands played by each policy")
+    parser.add_argument('--batch-size', type=int, default=100000, help="Hands simulated at once")
+    parser.add_argument('--seed', type=int, default=None, help="Random seed")
+    parser.add_argument('--per-state', default=None, help="Write per starting state results to this CSV file")
+    args = parser.parse_args()
+
+    models = args.model
+    thresholds = args.threshold
+    if not models and not thresholds and not args.exact:
+        default_model = os.path.join('ai', 'data', 'q_table.npy')
+        models = [default_model] if os.path.exists(default_model) else []
+        thresholds = [17]
+
+    policies = {}
+    for path in models:
+        agent = QLearningAgent()
+        if agent.load(path):
+            policies[os.path.basename(path)] = agent.compile_policy()
+    for stand_on in thresholds:
+        policies[f"hit under {stand_on}"] = threshold_policy(stand_on)
+    if args.exact:
+        from ai.solver import DealerPolicySolver
+        policies['exact'] = greedy_policy(DealerPolicySolver().solve())
+    if not policies:
+        parser.error("No policy to evaluate")
+
+    start_time = time.time()
+    results = evaluate(policies, num_hands=args.hands, batch_size=args.batch_size, seed=args.seed)
+    print_report(results, time.time() - start_time)
+    if args.per_state:
+        save_per_state(results, args.per_state)
@@ -0,0 +1,291 @@
+import numpy as np
+import json
+import math
+import time
+import os
+
+
+class RunningStats:
+    """
+    Running mean / variance / min / max in constant memory (Welford's algorithm)
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def push(self, x):
+        """Add one value"""
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+
+    def push_many(self, values):
+        """Add an array of values, merging its statistics in one step (Chan et al.)"""
+        values = np.asarray(values, dtype=np.float64)
+        if values.size == 0:
+            return
+        count = values.size
+        mean = float(values.mean())
+        m2 = float(((values - mean) ** 2).sum())
+
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+    def reset(self):
+        self.__init__()
+
+
+class RingBuffer:
+    """
+    Fixed-size window over the most recent values, with a running sum
+    """
+
+    def __init__(self, size, dtype=np.float64):
+        self.data = np.zeros(size, dtype=dtype)
+        self.size = size
+        self.index = 0
+        self.count = 0
+        self.total = 0.0
+
+    def push(self, x):
+        """Add one value, dropping the oldest one once the window is full"""
+        if self.count == self.size:
+            self.total -= self.data[self.index]
+        else:
+            self.count += 1
+        self.data[self.index] = x
+        self.total += x
+        self.index = (self.index + 1) % self.size
+
+    def push_many(self, values):
+        """Add an array of values"""
+        values = np.asarray(values)[-self.size:]
+        n = values.size
+        if n == 0:
+            return
+        end = self.index + n
+        if end <= self.size:
+            self.data[self.index:end] = values
+        else:
+            split = self.size - self.index
+            self.data[self.index:] = values[:split]
+            self.data[:end - self.size] = values[split:]
+        self.index = end % self.size
+        self.count = min(self.size, self.count + n)
+        # Recompute rather than track removals, this is O(size) per batch
+        self.total = float(self.data.sum()) if self.count == self.size else float(self.data[:self.count].sum())
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+
+class TrainingMetrics:
+    """
+    Constant-memory training statistics
+
+    Tracks win/loss/tie counts, running reward statistics, the average over
+    the most recent episodes, episodes per second and the size of Q-value
+    updates. Rates and Q-value deltas are reported both over the whole run
+    and over the interval since the previous snapshot.
+    """
+
+    def __init__(self, window=1000):
+        """
+        Args:
+            window (int): Number of recent episodes in the moving average
+        """
+        self.window = window
+        self.episodes = 0
+        self.wins = 0
+        self.losses = 0
+        self.ties = 0
+        self.rewards = RunningStats()
+        self.recent_rewards = RingBuffer(window)
+        self.q_delta = RunningStats()
+        self.interval_q_delta = RunningStats()
+        self.start_time = time.time()
+        self._last_time = self.start_time
+        self._last_episodes = 0
+
+    def record_episode(self, reward):
+        """Record the total reward of one episode"""
+        self.episodes += 1
+        if reward > 0:
+            self.wins += 1
+        elif reward < 0:
+            self.losses += 1
+        else:
+            self.ties += 1
+        self.rewards.push(reward)
+        self.recent_rewards.push(reward)
+
+    def record_episodes(self, rewards):
+        """Record the total rewards of a batch of episodes"""
+        rewards = np.asarray(rewards)
+        self.episodes += rewards.size
+        self.wins += int(np.count_nonzero(rewards > 0))
+        self.losses += int(np.count_nonzero(rewards < 0))
+        self.ties += int(np.count_nonzero(rewards == 0))
+        self.rewards.push_many(rewards)
+        self.recent_rewards.push_many(rewards)
+
+    def record_q_delta(self, delta):
+        """Record the absolute change of one Q-value update"""
+        delta = abs(delta)
+        self.q_delta.push(delta)
+        self.interval_q_delta.push(delta)
+
+    def record_q_deltas(self, deltas):
+        """Record the absolute changes of a batch of Q-values"""
+        deltas = np.abs(np.asarray(deltas))
+        self.q_delta.push_many(deltas)
+        self.interval_q_delta.push_many(deltas)
+
+    def snapshot(self, epsilon=None):
+        """
+        Current statistics; starts a new interval
+
+        Args:
+            epsilon (float): Current exploration rate of the agent (optional)
+
+        Returns:
+            dict: One row of metrics
+        """
+        now = time.time()
+        interval_time = now - self._last_time
+        interval_episodes = self.episodes - self._last_episodes
+        episodes = max(self.episodes, 1)
+
+        row = {
+            'episode': self.episodes,
+            'elapsed': now - self.start_time,
+            'episodes_per_sec': interval_episodes / interval_time if interval_time > 0 else 0.0,
+            'win_rate': self.wins / episodes,
+            'loss_rate': self.losses / episodes,
+            'tie_rate': self.ties / episodes,
+            'avg_reward': self.rewards.mean,
+            'reward_std': self.rewards.std,
+            'recent_avg_reward': self.recent_rewards.mean(),
+            'epsilon': epsilon,
+            'q_delta_mean': self.interval_q_delta.mean,
+            'q_delta_max': self.interval_q_delta.max if self.interval_q_delta.count else 0.0,
+        }
+
+        self._last_time = now
+        self._last_episodes = self.episodes
+        self.interval_q_delta.reset()
+        return row
+
+
+class MetricsWriter:
+    """
+    Streams metric rows to a CSV or JSON Lines file, chosen by extension
+    """
+
+    def __init__(self, filepath):
+        """
+        Args:
+            filepath (str): Output path, '.csv' for CSV, anything else for JSON Lines
+        """
+        os.makedirs(os.path.dirname(filepath) or '.', exist_ok=True)
+        self.filepath = filepath
+        self.csv = filepath.endswith('.csv')
+        self.columns = None
+        self.file = open(filepath, 'w')
+
+    def write(self, row):
+        """Append one row and flush it to disk"""
+        if self.csv:
+            if self.columns is None:
+                self.columns = list(row)
+                self.file.write(','.join(self.columns) + '\n')
+            self.file.write(','.join(self._format(row.get(c)) for c in self.columns) + '\n')
+        else:
+            self.file.write(json.dumps(row) + '\n')
+        self.file.flush()
+
+    @staticmethod
+    def _format(value):
+        if value is None:
+            return ''
+        if isinstance(value, float):
+            return f'{value:.6g}'
+        return str(value)
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+
+class ConvergenceMonitor:
+    """
+    Detects when training has converged: the Q-table changes by less than a
+    threshold between consecutive metrics intervals, several intervals in a row
+
+    Only (state, action) entries with at least min_visits updates are compared,
+    the first updates of a rarely seen entry always move it a lot. An interval
+    where no entry has that many visits never counts as converged. With a
+    constant learning rate the Q-values keep fluctuating with the rewards, so
+    convergence is only reached with an adaptive schedule or a small rate.
+    """
+
+    def __init__(self, threshold, patience=5, min_visits=100):
+        """
+        Args:
+            threshold (float): Largest |dQ| between intervals that counts as converged
+            patience (int): Consecutive converged intervals needed to stop
+            min_visits (int): Entries visited fewer times are not compared
+        """
+        self.threshold = threshold
+        self.patience = patience
+        self.min_visits = min_visits
+        self.streak = 0
+        self.last_change = None
+        self._previous = None
+
+    def update(self, q_table, visits):
+        """
+        Compare the Q-table with the one of the previous interval
+
+        Args:
+            q_table (np.ndarray): Current Q-table
+            visits (np.ndarray): Visit count of every Q-table entry
+
+        Returns:
+            bool: True once training has converged
+        """
+        if self._previous is not None:
+            compared = visits >= self.min_visits
+            # Nothing to compare is not convergence, the change is reported as infinite
+            self.last_change = float(np.abs(q_table - self._previous)[compared].max()) if compared.any() else math.inf
+            self.streak = self.streak + 1 if self.last_change < self.threshold else 0
+        self._previous = np.array(q_table, dtype=np.float64)
+        return self.streak >= self.patience
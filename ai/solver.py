@@ -0,0 +1,161 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai.agent import QLearningAgent
+from ai.dealer_outcomes import CARD_PROBS, DealerOutcomeCache, add_card
+from models.Hand import hand_value
+from models.Outcome import Outcome, classify
+import numpy as np
+import argparse
+import time
+
+
+class DealerPolicySolver:
+    """
+    Exact solver for the HIT/STAND policy trained by QLearningAgent
+
+    Expected values are computed by expectimax over card probabilities of an
+    infinite shoe, using the rules of BlackjackEnv. Hands are tracked by their
+    exact totals (hard total, Aces, cards); several hands can share a Q-table
+    cell (e.g. a soft 21 of three cards with a hard total of 11 or 12), in which
+    case the cell holds their average weighted by how likely each hand is to be
+    reached when always hitting.
+
+    Only valid actions are maximized over. Invalid actions (STAND below 16)
+    are written as -1, the worst possible reward.
+    """
+
+    def __init__(self, discount_factor=0.95, dealer_outcomes=None):
+        """
+        Args:
+            discount_factor (float): Discount factor (gamma), as in QLearningAgent
+            dealer_outcomes (DealerOutcomeCache): Shared dealer outcome cache (optional)
+        """
+        self.gamma = discount_factor
+        self.dealer_outcomes = dealer_outcomes if dealer_outcomes is not None else DealerOutcomeCache()
+        self.q_table = np.zeros((32, 12, 6, 2, 2))
+        # Cells where both actions are valid and the hand can be reached
+        self.decision_mask = np.zeros((32, 12, 6, 2), dtype=bool)
+        self._values = {}
+
+    def _q_values(self, hard, aces, count, dealer_showing):
+        """
+        Q-values of a player hand that is still in play
+
+        Returns:
+            tuple: (Q(s, HIT), Q(s, STAND)), Q(s, STAND) is None if standing is invalid
+        """
+        value = hand_value(hard, aces, count)
+        expected_reward = self.dealer_outcomes.expected_reward
+        q_stand = expected_reward(dealer_showing, value, Outcome.NONE) if value >= 16 else None
+
+        q_hit = 0.0
+        for card, prob in CARD_PROBS:
+            next_hand = add_card(hard, aces, count, card)
+            next_value = hand_value(*next_hand)
+            if next_value > 21 or next_hand[2] >= 5:
+                # Bust or 5 cards - the dealer plays out immediately
+                q_hit += prob * expected_reward(dealer_showing, next_value, classify(next_hand[2], next_hand[0], next_hand[1]))
+            else:
+                q_hit += prob * self.gamma * self._value(*next_hand, dealer_showing)
+        return q_hit, q_stand
+
+    def _value(self, hard, aces, count, dealer_showing):
+        key = (hard, aces, count, dealer_showing)
+        if key not in self._values:
+            q_hit, q_stand = self._q_values(hard, aces, count, dealer_showing)
+            self._values[key] = q_hit if q_stand is None else max(q_hit, q_stand)
+        return self._values[key]
+
+    def solve(self):
+        """
+        Compute the exact Q-table
+
+        Returns:
+            np.ndarray: Q-table in the (32, 12, 6, 2, 2) layout of QLearningAgent
+        """
+        sums = np.zeros_like(self.q_table)
+        weights = np.zeros(self.q_table.shape[:-1])
+
+        for dealer_showing in range(1, 11):
+            # Probability of each two-card player hand
+            reach = {}
+            for first, p_first in CARD_PROBS:
+                for second, p_second in CARD_PROBS:
+                    hand = add_card(*add_card(0, 0, 0, first), second)
+                    reach[hand] = reach.get(hand, 0.0) + p_first * p_second
+
+            for count in (2, 3, 4):
+                next_reach = {}
+                for (hard, aces, _), prob in reach.items():
+                    value = hand_value(hard, aces, count)
+                    cell = (value, dealer_showing, count, int(value > hard))
+                    weights[cell] += prob
+
+                    if count == 2 and classify(count, hard, aces):
+                        # Initial special case - player wins whatever the action
+                        sums[cell] += prob
+                        continue
+
+                    q_hit, q_stand = self._q_values(hard, aces, count, dealer_showing)
+                    sums[cell + (0,)] += prob * q_hit
+                    sums[cell + (1,)] += prob * (-1.0 if q_stand is None else q_stand)
+                    if q_stand is not None:
+                        self.decision_mask[cell] = True
+
+                    # Hands reachable by hitting again
+                    for card, p_card in CARD_PROBS:
+                        next_hand = add_card(hard, aces, count, card)
+                        if next_hand[2] < 5 and hand_value(*next_hand) <= 21:
+                            next_reach[next_hand] = next_reach.get(next_hand, 0.0) + prob * p_card
+                reach = next_reach
+
+        reached = weights > 0
+        self.q_table[reached] = sums[reached] / weights[reached][:, None]
+        return self.q_table
+
+    def policy(self):
+        """
+        Greedy action of every Q-table cell, HIT below 16
+
+        Returns:
+            np.ndarray: (32, 12, 6, 2) array of actions (0 = HIT, 1 = STAND)
+        """
+        return np.argmax(self.q_table, axis=-1)
+
+    def agreement(self, q_table):
+        """
+        Fraction of decision cells where a Q-table picks the same action as the exact solution
+
+        Args:
+            q_table (np.ndarray): Q-table to validate, e.g. a learned one
+
+        Returns:
+            float: Agreement in [0, 1]
+        """
+        learned = np.argmax(q_table, axis=-1)
+        return float(np.mean(learned[self.decision_mask] == self.policy()[self.decision_mask]))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compute the exact Q-table for the Blackjack dealer")
+    parser.add_argument('--gamma', type=float, default=0.95, help="Discount factor")
+    parser.add_argument('--output', default=os.path.join('ai', 'data', 'q_table_exact.npy'), help="Where to save the Q-table")
+    parser.add_argument('--compare', default=None, help="Q-table to validate against the exact solution")
+    parser.add_argument('--dealer-table', default=None, help="Precomputed dealer outcome table (see ai/dealer_outcomes.py)")
+    args = parser.parse_args()
+
+    start_time = time.time()
+    solver = DealerPolicySolver(discount_factor=args.gamma, dealer_outcomes=DealerOutcomeCache(table_path=args.dealer_table))
+    q_table = solver.solve()
+    print(f"Solved in {time.time() - start_time:.3f}s")
+
+    agent = QLearningAgent(discount_factor=args.gamma)
+    agent.q_table = q_table
+    agent.save(args.output)
+
+    if args.compare:
+        other = QLearningAgent()
+        if other.load(args.compare):
+            print(f"Policy agreement with {args.compare}: {solver.agreement(other.q_table) * 100:.2f}%")
@@ -3,192 +3,467 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from ai.env import BlackjackEnv
-from ai.agent import QLearningAgent
+from ai.agent import QLearningAgent, MODEL_DTYPES, LR_SCHEDULES, EXPLORATION_SCHEDULES
+from ai.metrics import TrainingMetrics, MetricsWriter, ConvergenceMonitor
+from ai.evaluate import evaluate
+from utils.profiler import TRAINING_SECTIONS, enable_from_option
+from multiprocessing import shared_memory
+import multiprocessing
+import argparse
+import random
 import numpy as np
 import time
 
 
-def train_agent(num_episodes=100000, save_interval=10000):
+DEFAULT_MODEL_PATH = os.path.join('ai', 'data', 'q_table.npy')
+
+# QLearningAgent parameters of a training run, overridden by train_agent's agent_params
+DEFAULT_AGENT_PARAMS = dict(
+    learning_rate=0.1,
+    discount_factor=0.95,
+    epsilon=1.0,
+    epsilon_decay=0.9995,
+    epsilon_min=0.01
+)
+
+
+def positive_int(text):
+    """argparse type of the interval options, 0 would divide by zero or never advance"""
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+
+def get_valid_actions(env):
+    """
+    Valid actions for the player of the environment
+    
+    Args:
+        env (BlackjackEnv): Environment in the middle of an episode
+        
+    Returns:
+        list: Valid actions (0 = HIT, 1 = STAND)
+    """
+    valid_actions = []
+    if env.player_hand.value >= 16:
+        valid_actions.append(1)
+    if env.player_hand.num_of_cards() < 5 and env.player_hand.value <= 21:
+        valid_actions.append(0)
+    
+    # If no valid actions or player must hit (value < 16), force HIT
+    if not valid_actions or env.player_hand.value < 16:
+        valid_actions = [0]
+    return valid_actions
+
+
+def run_episode(env, agent, metrics=None):
+    """
+    Play one training episode and update the agent after every step
+    
+    Args:
+        env (BlackjackEnv): Environment
+        agent (QLearningAgent): Agent being trained, counts its own visits
+        metrics (TrainingMetrics): Metrics recording the Q-value updates (optional)
+        
+    Returns:
+        int: Total reward of the episode
+    """
+    state = env.reset()
+    episode_reward = 0
+    done = False
+    
+    while not done:
+        valid_actions = get_valid_actions(env)
+        
+        # Get action from agent
+        action = agent.get_action(state, valid_actions=valid_actions, training=True)
+        
+        # Take action
+        next_state, reward, done = env.step(action)
+        
+        # Update Q-table
+        delta = agent.update(state, action, reward, next_state, done)
+        if metrics is not None:
+            metrics.record_q_delta(delta)
+        
+        state = next_state
+        episode_reward += reward
+    
+    return episode_reward
+
+
+def _print_progress(row, num_episodes):
+    """Print one metrics row as a progress report"""
+    print(f"Episode: {row['episode']:,}/{num_episodes:,}")
+    print(f"  Time elapsed: {row['elapsed']:.1f}s ({row['episodes_per_sec']:.0f} episodes/s)")
+    print(f"  Win rate: {row['win_rate'] * 100:.2f}% | Loss rate: {row['loss_rate'] * 100:.2f}% | Tie rate: {row['tie_rate'] * 100:.2f}%")
+    print(f"  Average reward: {row['avg_reward']:.4f}")
+    print(f"  Recent 1000 avg reward: {row['recent_avg_reward']:.4f}")
+    if row['epsilon'] is not None:
+        print(f"  Epsilon: {row['epsilon']:.4f}")
+    print(f"  Recent max |dQ|: {row['q_delta_max']:.4f}")
+    if row.get('q_change_max') is not None:
+        print(f"  Max Q-value change since last interval: {row['q_change_max']:.4f}")
+    print()
+
+
+def _print_summary(metrics):
+    """Print the final training statistics"""
+    print("=" * 60)
+    print("TRAINING COMPLETE!")
+    print("=" * 60)
+    
+    episodes = max(metrics.episodes, 1)
+    total_time = time.time() - metrics.start_time
+    print(f"Total training time: {total_time:.1f}s ({total_time/60:.1f} minutes)")
+    print(f"Games per second: {metrics.episodes/total_time:.1f}")
+    print()
+    print(f"Final Win rate: {metrics.wins / episodes * 100:.2f}%")
+    print(f"Final Loss rate: {metrics.losses / episodes * 100:.2f}%")
+    print(f"Final Tie rate: {metrics.ties / episodes * 100:.2f}%")
+    print(f"Average reward: {metrics.rewards.mean:.4f}")
+    print()
+
+
+def _global_epsilon(agent):
+    """Exploration rate to report, None when the agent explores per state and epsilon plays no part"""
+    return agent.epsilon if agent.exploration == 'decay' else None
+
+
+def _training_stats(metrics, agent, seed, converged=False):
+    """Summary of a training run, stored in the header of .npz models"""
+    episodes = max(metrics.episodes, 1)
+    stats = {
+        'episodes': metrics.episodes,
+        'win_rate': metrics.wins / episodes,
+        'loss_rate': metrics.losses / episodes,
+        'tie_rate': metrics.ties / episodes,
+        'avg_reward': metrics.rewards.mean,
+        'seed': seed,
+        'training_time': time.time() - metrics.start_time,
+        'converged': converged,
+    }
+    if agent.exploration == 'decay':
+        stats['final_epsilon'] = agent.epsilon
+    else:
+        stats['exploration_constant'] = agent.exploration_constant
+    return stats
+
+
+def train_agent(num_episodes=100000, save_interval=10000, workers=1, sync_interval=1000, seed=None,
+                metrics_path=None, log_interval=1000, save_path=DEFAULT_MODEL_PATH, dtype='float32',
+                agent_params=None, converge_threshold=None, converge_patience=5,
+                converge_min_visits=100):
     """
     Train the Q-learning agent
     
     Args:
         num_episodes (int): Number of episodes to train
         save_interval (int): Save Q-table every N episodes
+        workers (int): Number of worker processes (1 = train in this process)
+        sync_interval (int): Episodes each worker plays between Q-table merges
+        seed (int): Seed for the random generators (optional)
+        metrics_path (str): Stream metrics to this CSV or JSON Lines file (optional)
+        log_interval (int): Write a metrics row every N episodes
+        save_path (str): Where to save the Q-table, a .npz path saves a versioned model (see QLearningAgent.save)
+        dtype (str): Storage dtype of a .npz model
+        agent_params (dict): QLearningAgent parameters overriding DEFAULT_AGENT_PARAMS (optional)
+        converge_threshold (float): Stop early once no well-visited Q-value moves more than this
+            between metrics intervals, converge_patience intervals in a row (optional)
+        converge_patience (int): Consecutive converged intervals needed to stop
+        converge_min_visits (int): Only Q-values updated at least this often are checked for convergence
     """
+    for name, interval in (('save_interval', save_interval), ('sync_interval', sync_interval),
+                           ('log_interval', log_interval), ('converge_patience', converge_patience)):
+        if interval < 1:
+            raise ValueError(f"{name} must be at least 1, got {interval}")
+    
     print("=" * 60)
     print("Q-LEARNING BLACKJACK AGENT TRAINING")
     print("=" * 60)
     print(f"Training for {num_episodes:,} episodes...")
     print()
     
+    if workers > 1:
+        return train_agent_parallel(num_episodes, save_interval, workers, sync_interval, seed,
+                                    metrics_path, log_interval, save_path, dtype,
+                                    agent_params, converge_threshold, converge_patience, converge_min_visits)
+    
+    if seed is not None:
+        random.seed(seed)
+    
     # Initialize environment and agent
     env = BlackjackEnv()
-    agent = QLearningAgent(
-        learning_rate=0.1,
-        discount_factor=0.95,
-        epsilon=1.0,
-        epsilon_decay=0.9995,
-        epsilon_min=0.01
-    )
-    
-    # Metrics tracking
-    wins = 0
-    losses = 0
-    ties = 0
-    total_reward = 0
-    episode_rewards = []
-    
-    start_time = time.time()
+    agent = QLearningAgent(**dict(DEFAULT_AGENT_PARAMS, **(agent_params or {})))
+    
+    # Metrics tracking, constant memory whatever the number of episodes
+    metrics = TrainingMetrics(window=1000)
+    writer = MetricsWriter(metrics_path) if metrics_path else None
+    monitor = ConvergenceMonitor(converge_threshold, converge_patience, converge_min_visits) if converge_threshold else None
+    converged = False
     
     # Training loop
     for episode in range(1, num_episodes + 1):
-        state = env.reset()
-        episode_reward = 0
-        done = False
-        
-        while not done:
-            valid_actions = []
-            if env.player_hand.value >= 16:
-                valid_actions.append(1)
-            if env.player_hand.num_of_cards() < 5 and env.player_hand.value <= 21:
-                valid_actions.append(0)
-            
-            # If no valid actions or player must hit (value < 16), force HIT
-            if not valid_actions or env.player_hand.value < 16:
-                valid_actions = [0]
-            
-            # Get action from agent
-            action = agent.get_action(state, valid_actions=valid_actions, training=True)
-            
-            # Take action
-            next_state, reward, done = env.step(action)
-            
-            # Update Q-table
-            agent.update(state, action, reward, next_state, done)
-            
-            state = next_state
-            episode_reward += reward
+        episode_reward = run_episode(env, agent, metrics=metrics)
         
         # Track results
-        total_reward += episode_reward
-        episode_rewards.append(episode_reward)
-        
-        if episode_reward > 0:
-            wins += 1
-        elif episode_reward < 0:
-            losses += 1
-        else:
-            ties += 1
+        metrics.record_episode(episode_reward)
         
         # Decay epsilon
         agent.decay_epsilon()
         
+        if episode % log_interval == 0 or episode % save_interval == 0:
+            row = metrics.snapshot(_global_epsilon(agent))
+            if monitor:
+                converged = monitor.update(agent.q_table, agent.visits)
+                row['q_change_max'] = monitor.last_change
+            if writer:
+                writer.write(row)
+        
         # Print progress
         if episode % save_interval == 0:
-            elapsed_time = time.time() - start_time
-            avg_reward = total_reward / episode
-            win_rate = (wins / episode) * 100
-            loss_rate = (losses / episode) * 100
-            tie_rate = (ties / episode) * 100
-            recent_avg = np.mean(episode_rewards[-1000:]) if len(episode_rewards) >= 1000 else np.mean(episode_rewards)
-            
-            print(f"Episode: {episode:,}/{num_episodes:,}")
-            print(f"  Time elapsed: {elapsed_time:.1f}s")
-            print(f"  Win rate: {win_rate:.2f}% | Loss rate: {loss_rate:.2f}% | Tie rate: {tie_rate:.2f}%")
-            print(f"  Average reward: {avg_reward:.4f}")
-            print(f"  Recent 1000 avg reward: {recent_avg:.4f}")
-            print(f"  Epsilon: {agent.epsilon:.4f}")
-            print()
+            _print_progress(row, num_episodes)
             
             # Save Q-table
-            save_path = os.path.join('ai', 'data', 'q_table.npy')
-            agent.save(save_path)
+            agent.save(save_path, dtype=dtype, training_stats=_training_stats(metrics, agent, seed))
+        
+        if converged:
+            print(f"Converged after {episode:,} episodes: Q-values moved less than {converge_threshold} "
+                  f"for {converge_patience} intervals in a row")
+            print()
+            break
+    
+    if writer:
+        writer.close()
     
     # Final save and statistics
-    print("=" * 60)
-    print("TRAINING COMPLETE!")
-    print("=" * 60)
+    _print_summary(metrics)
     
-    total_time = time.time() - start_time
-    final_win_rate = (wins / num_episodes) * 100
-    final_loss_rate = (losses / num_episodes) * 100
-    final_tie_rate = (ties / num_episodes) * 100
-    final_avg_reward = total_reward / num_episodes
+    # Save final Q-table
+    agent.save(save_path, dtype=dtype, training_stats=_training_stats(metrics, agent, seed, converged))
     
-    print(f"Total training time: {total_time:.1f}s ({total_time/60:.1f} minutes)")
-    print(f"Games per second: {num_episodes/total_time:.1f}")
     print()
-    print(f"Final Win rate: {final_win_rate:.2f}%")
-    print(f"Final Loss rate: {final_loss_rate:.2f}%")
-    print(f"Final Tie rate: {final_tie_rate:.2f}%")
-    print(f"Average reward: {final_avg_reward:.4f}")
+    print(f"Q-table has been saved to '{save_path}'")
+    print("You can now use this trained agent to play!")
+    print("=" * 60)
+
+
+# Per-process state of a training worker, created on its first round
+_worker = {}
+
+
+def _train_worker_round(task):
+    """
+    Play one round of episodes in a worker process
+    
+    The worker starts from the merged Q-table and visit counts in shared
+    memory and writes its own Q-table and the visits of this round back into
+    its slot.
+    
+    Args:
+        task (dict): Round description sent by train_agent_parallel
+        
+    Returns:
+        np.ndarray: Total reward of every episode of the round
+    """
+    if 'env' not in _worker:
+        _worker['env'] = BlackjackEnv()
+        _worker['agent'] = QLearningAgent(**task['agent_params'])
+        _worker['shm'] = {name: shared_memory.SharedMemory(name=name) for name in task['shm_names']}
+    env, agent, shm = _worker['env'], _worker['agent'], _worker['shm']
+    
+    shape = agent.q_table.shape
+    merged_q = np.ndarray(shape, dtype=np.float64, buffer=shm[task['shm_names'][0]].buf)
+    worker_q = np.ndarray((task['workers'],) + shape, dtype=np.float64, buffer=shm[task['shm_names'][1]].buf)
+    worker_visits = np.ndarray((task['workers'],) + shape, dtype=np.int64, buffer=shm[task['shm_names'][2]].buf)
+    merged_visits = np.ndarray(shape, dtype=np.int64, buffer=shm[task['shm_names'][3]].buf)
+    
+    # Independent, reproducible random stream per worker and round
+    worker_id = task['worker_id']
+    random.seed(int(np.random.SeedSequence([task['seed'], worker_id, task['round']]).generate_state(1)[0]))
+    
+    agent.q_table[:] = merged_q
+    agent.visits[:] = merged_visits
+    agent.epsilon = task['epsilon']
+    
+    rewards = np.zeros(task['episodes'], dtype=np.int8)
+    for i in range(task['episodes']):
+        rewards[i] = run_episode(env, agent)
+        agent.decay_epsilon()
+    
+    worker_q[worker_id] = agent.q_table
+    worker_visits[worker_id] = agent.visits - merged_visits
+    return rewards
+
+
+def train_agent_parallel(num_episodes, save_interval, workers, sync_interval=1000, seed=None,
+                         metrics_path=None, log_interval=1000, save_path=DEFAULT_MODEL_PATH, dtype='float32',
+                         agent_params=None, converge_threshold=None, converge_patience=5,
+                         converge_min_visits=100):
+    """
+    Train the Q-learning agent on several worker processes
+    
+    Every round, each worker plays sync_interval episodes starting from the
+    merged Q-table. The worker tables are then merged into one, weighting each
+    (state, action) entry by how often each worker visited it during the round.
+    Epsilon decays once per episode across all workers, so the schedule matches
+    single-process training.
+    
+    Args:
+        num_episodes (int): Total number of episodes to train
+        save_interval (int): Save Q-table every N episodes
+        workers (int): Number of worker processes
+        sync_interval (int): Episodes each worker plays between merges
+        seed (int): Seed for the workers' random generators (optional)
+        metrics_path (str): Stream metrics to this CSV or JSON Lines file (optional)
+        log_interval (int): Write a metrics row every N episodes (rounded to whole rounds)
+        save_path (str): Where to save the Q-table, a .npz path saves a versioned model
+        dtype (str): Storage dtype of a .npz model
+        agent_params (dict): QLearningAgent parameters overriding DEFAULT_AGENT_PARAMS (optional)
+        converge_threshold (float): Stop early once no well-visited Q-value moves more than this
+            between metrics intervals, converge_patience intervals in a row (optional)
+        converge_patience (int): Consecutive converged intervals needed to stop
+        converge_min_visits (int): Only Q-values updated at least this often are checked for convergence
+    
+    The Q-value deltas reported are the changes of the merged table at each merge.
+    """
+    agent_params = dict(DEFAULT_AGENT_PARAMS, **(agent_params or {}))
+    agent = QLearningAgent(**agent_params)
+    # Each worker only plays every workers-th episode of the shared schedule
+    worker_params = dict(agent_params, epsilon_decay=agent_params['epsilon_decay'] ** workers)
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    
+    print(f"Using {workers} worker processes, merging every {sync_interval:,} episodes per worker")
     print()
     
-    # Save final Q-table
-    save_path = os.path.join('ai', 'data', 'q_table.npy')
-    agent.save(save_path)
+    shape = agent.q_table.shape
+    table_size = agent.q_table.nbytes
+    blocks = [
+        shared_memory.SharedMemory(create=True, size=table_size),
+        shared_memory.SharedMemory(create=True, size=workers * table_size),
+        shared_memory.SharedMemory(create=True, size=workers * agent.visits.nbytes),
+        shared_memory.SharedMemory(create=True, size=agent.visits.nbytes),
+    ]
+    shm_names = [block.name for block in blocks]
+    merged_q = np.ndarray(shape, dtype=np.float64, buffer=blocks[0].buf)
+    worker_q = np.ndarray((workers,) + shape, dtype=np.float64, buffer=blocks[1].buf)
+    worker_visits = np.ndarray((workers,) + shape, dtype=np.int64, buffer=blocks[2].buf)
+    merged_visits = np.ndarray(shape, dtype=np.int64, buffer=blocks[3].buf)
+    merged_q[:] = agent.q_table
+    merged_visits[:] = 0
+    
+    metrics = TrainingMetrics(window=1000)
+    writer = MetricsWriter(metrics_path) if metrics_path else None
+    monitor = ConvergenceMonitor(converge_threshold, converge_patience, converge_min_visits) if converge_threshold else None
+    converged = False
+    episode = 0
+    next_log = log_interval
+    next_report = save_interval
+    round_idx = 0
+    
+    try:
+        with multiprocessing.Pool(workers) as pool:
+            while episode < num_episodes:
+                # Split the remaining episodes of this round between the workers
+                round_episodes = min(sync_interval * workers, num_episodes - episode)
+                counts = [round_episodes // workers + (1 if i < round_episodes % workers else 0) for i in range(workers)]
+                tasks = [dict(
+                    worker_id=i, workers=workers, round=round_idx, seed=seed, episodes=counts[i],
+                    epsilon=agent.epsilon, agent_params=worker_params, shm_names=shm_names
+                ) for i in range(workers)]
+                
+                for rewards in pool.map(_train_worker_round, tasks):
+                    metrics.record_episodes(rewards)
+                
+                # Visit-count-weighted average of the worker tables
+                total_visits = worker_visits.sum(axis=0)
+                merged_visits += total_visits
+                weighted_q = (worker_q * worker_visits).sum(axis=0)
+                visited = total_visits > 0
+                new_q = weighted_q[visited] / total_visits[visited]
+                metrics.record_q_deltas(new_q - merged_q[visited])
+                merged_q[visited] = new_q
+                
+                for _ in range(round_episodes):
+                    agent.decay_epsilon()
+                episode += round_episodes
+                round_idx += 1
+                
+                report = episode >= next_report or episode == num_episodes
+                if episode >= next_log or report:
+                    while next_log <= episode:
+                        next_log += log_interval
+                    row = metrics.snapshot(_global_epsilon(agent))
+                    if monitor:
+                        converged = monitor.update(merged_q, merged_visits)
+                        row['q_change_max'] = monitor.last_change
+                    if writer:
+                        writer.write(row)
+                
+                # Print progress
+                if report or converged:
+                    while next_report <= episode:
+                        next_report += save_interval
+                    _print_progress(row, num_episodes)
+                    
+                    agent.q_table[:] = merged_q
+                    agent.visits[:] = merged_visits
+                    agent.save(save_path, dtype=dtype, training_stats=_training_stats(metrics, agent, seed))
+                
+                if converged:
+                    print(f"Converged after {episode:,} episodes: Q-values moved less than {converge_threshold} "
+                          f"for {converge_patience} intervals in a row")
+                    print()
+                    break
+        
+        agent.q_table[:] = merged_q
+        agent.visits[:] = merged_visits
+    finally:
+        del merged_q, worker_q, worker_visits, merged_visits
+        for block in blocks:
+            block.close()
+            block.unlink()
+        if writer:
+            writer.close()
+    
+    _print_summary(metrics)
+    
+    agent.save(save_path, dtype=dtype, training_stats=_training_stats(metrics, agent, seed, converged))
     
     print()
-    print("Q-table has been saved to 'ai/data/q_table.npy'")
+    print(f"Q-table has been saved to '{save_path}'")
     print("You can now use this trained agent to play!")
     print("=" * 60)
 
 
-def test_agent(num_games=1000):
+def test_agent(num_games=1000, model_path=DEFAULT_MODEL_PATH):
     """
     Test the trained agent
     
     Args:
         num_games (int): Number of games to test
+        model_path (str): Q-table to test, .npy or .npz
     """
     print("=" * 60)
     print("TESTING TRAINED AGENT")
     print("=" * 60)
     
-    env = BlackjackEnv()
     agent = QLearningAgent()
     
     # Load trained Q-table
-    save_path = os.path.join('ai', 'data', 'q_table.npy')
-    if not agent.load(save_path):
+    if not agent.load(model_path):
         print("ERROR: No trained Q-table found. Please run training first.")
         return
     
     print(f"Testing for {num_games:,} games...")
     print()
     
-    wins = 0
-    losses = 0
-    ties = 0
-    
-    for game in range(1, num_games + 1):
-        state = env.reset()
-        done = False
-        
-        while not done:
-            valid_actions = []
-            if env.player_hand.value >= 16:
-                valid_actions.append(1)
-            if env.player_hand.num_of_cards() < 5 and env.player_hand.value <= 21:
-                valid_actions.append(0)
-            
-            if not valid_actions or env.player_hand.value < 16:
-                valid_actions = [0]
-            
-            # Get action
-            action = agent.get_action(state, valid_actions=valid_actions, training=False)
-            
-            # Take action
-            next_state, reward, done = env.step(action)
-            state = next_state
-        
-        if reward > 0:
-            wins += 1
-        elif reward < 0:
-            losses += 1
-        else:
-            ties += 1
+    # Vectorized over batches of games, see ai/evaluate.py
+    result = evaluate({model_path: agent.compile_policy()}, num_hands=num_games)[0]
+    wins, ties, losses = (int(count.sum()) for count in (result.wins, result.ties, result.losses))
+    ev, ev_ci = result.expected_value()
     
     # Print results
     print("=" * 60)
@@ -198,10 +473,50 @@ def test_agent(num_games=1000):
     print(f"Wins: {wins:,} ({(wins/num_games)*100:.2f}%)")
     print(f"Losses: {losses:,} ({(losses/num_games)*100:.2f}%)")
     print(f"Ties: {ties:,} ({(ties/num_games)*100:.2f}%)")
+    print(f"Expected value: {ev:+.4f} +/- {ev_ci:.4f} chips per chip bet (95% confidence)")
     print("=" * 60)
 
 
 if __name__ == "__main__":
-    train_agent(num_episodes=100000, save_interval=10000)
-    print("\n\n")
-    test_agent(num_games=10000)
+    parser = argparse.ArgumentParser(description="Train the Q-learning Blackjack dealer")
+    parser.add_argument('--episodes', type=int, default=100000, help="Number of training episodes")
+    parser.add_argument('--save-interval', type=positive_int, default=10000, help="Save Q-table every N episodes")
+    parser.add_argument('--workers', type=positive_int, default=1, help="Number of worker processes")
+    parser.add_argument('--sync-interval', type=positive_int, default=1000, help="Episodes per worker between Q-table merges")
+    parser.add_argument('--seed', type=int, default=None, help="Random seed")
+    parser.add_argument('--metrics', default=None, help="Stream training metrics to a .csv or .jsonl file")
+    parser.add_argument('--log-interval', type=positive_int, default=1000, help="Write a metrics row every N episodes")
+    parser.add_argument('--output', default=DEFAULT_MODEL_PATH,
+                        help="Where to save the Q-table, a .npz path saves a versioned model with metadata")
+    parser.add_argument('--dtype', choices=MODEL_DTYPES, default='float32',
+                        help="Storage dtype of a .npz model (int8 is quantized)")
+    parser.add_argument('--lr-schedule', choices=LR_SCHEDULES, default='constant',
+                        help="Learning rate: fixed --lr, 1/N or 1/N^--lr-power of each (state, action) visit count N")
+    parser.add_argument('--lr', type=float, default=DEFAULT_AGENT_PARAMS['learning_rate'], help="Learning rate of the constant schedule")
+    parser.add_argument('--lr-power', type=float, default=0.8, help="Exponent of the polynomial schedule, in (0.5, 1]")
+    parser.add_argument('--exploration', choices=EXPLORATION_SCHEDULES, default='decay',
+                        help="Decay one epsilon per episode, or explore each state less as it is visited")
+    parser.add_argument('--exploration-constant', type=float, default=100,
+                        help="Visits after which a state is explored half the time (--exploration visits)")
+    parser.add_argument('--converge-threshold', type=float, default=None,
+                        help="Stop once no well-visited Q-value moves more than this between metrics intervals")
+    parser.add_argument('--converge-patience', type=positive_int, default=5,
+                        help="Consecutive metrics intervals under --converge-threshold needed to stop")
+    parser.add_argument('--converge-min-visits', type=positive_int, default=100,
+                        help="Only Q-values updated at least this often are checked for convergence")
+    parser.add_argument('--test-games', type=int, default=10000, help="Number of test games after training")
+    parser.add_argument('--profile', nargs='?', const='1', default=None,
+                        help="Time hot paths and print a report on exit; a path also saves cProfile stats there")
+    args = parser.parse_args()
+    enable_from_option(args.profile, sections=TRAINING_SECTIONS)
+    
+    train_agent(num_episodes=args.episodes, save_interval=args.save_interval, workers=args.workers,
+                sync_interval=args.sync_interval, seed=args.seed, metrics_path=args.metrics,
+                log_interval=args.log_interval, save_path=args.output, dtype=args.dtype,
+                agent_params=dict(learning_rate=args.lr, lr_schedule=args.lr_schedule, lr_power=args.lr_power,
+                                  exploration=args.exploration, exploration_constant=args.exploration_constant),
+                converge_threshold=args.converge_threshold, converge_patience=args.converge_patience,
+                converge_min_visits=args.converge_min_visits)
+    if args.test_games > 0:
+        print("\n\n")
+        test_agent(num_games=args.test_games, model_path=args.output)
@@ -0,0 +1,127 @@
+import platform
+import subprocess
+import timeit
+import time
+import json
+import os
+
+
+# Registered benchmarks: name -> (group, setup function)
+BENCHMARKS = {}
+
+
+def benchmark(name, group='micro'):
+    """
+    Register a benchmark
+
+    The decorated function does the setup and returns (func, ops), where
+    func is the zero-argument callable to time and ops is how many
+    operations one call of func performs.
+
+    Args:
+        name (str): Unique benchmark name, e.g. 'models.deck_deal'
+        group (str): 'micro' or 'macro'
+    """
+    def decorator(setup):
+        BENCHMARKS[name] = (group, setup)
+        return setup
+    return decorator
+
+
+def measure(func, ops=1, repeat=5, min_time=0.2):
+    """
+    Time a callable, keeping the best of several repeats
+
+    Args:
+        func (callable): Zero-argument callable to time
+        ops (int): Operations performed by one call
+        repeat (int): Number of timed repeats
+        min_time (float): Minimum duration of one repeat in seconds
+
+    Returns:
+        dict: ops_per_sec and usec_per_op of the fastest repeat
+    """
+    timer = timeit.Timer(func)
+    number, elapsed = timer.autorange()
+    if elapsed < min_time:
+        number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+    best = min(timer.repeat(repeat=repeat, number=number)) / (number * ops)
+    return {
+        'ops_per_sec': 1.0 / best,
+        'usec_per_op': best * 1e6,
+        'calls': number,
+        'repeat': repeat,
+    }
+
+
+def run(names, repeat=5, min_time=0.2):
+    """
+    Run benchmarks by name
+
+    Returns:
+        dict: name -> result (or {'skipped': reason} if the setup failed)
+    """
+    results = {}
+    for name in names:
+        group, setup = BENCHMARKS[name]
+        try:
+            func, ops = setup()
+        except Exception as e:
+            results[name] = {'group': group, 'skipped': f'{type(e).__name__}: {e}'}
+            print(f"{name:<40} skipped ({type(e).__name__}: {e})")
+            continue
+        result = measure(func, ops, repeat, min_time)
+        result['group'] = group
+        results[name] = result
+        print(f"{name:<40} {result['ops_per_sec']:>14,.1f} ops/s {result['usec_per_op']:>12.3f} us/op")
+    return results
+
+
+def metadata():
+    """Environment of the run, so result files can be told apart"""
+    def version(module):
+        try:
+            return __import__(module).__version__
+        except Exception:
+            return None
+
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+
+    return {
+        'commit': commit or None,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': version('numpy'),
+        'pygame': version('pygame'),
+    }
+
+
+def save(results, filepath):
+    os.makedirs(os.path.dirname(filepath) or '.', exist_ok=True)
+    with open(filepath, 'w') as f:
+        json.dump({'meta': metadata(), 'results': results}, f, indent=2, sort_keys=True)
+    print(f"Results saved to {filepath}")
+
+
+def compare(baseline_path, results):
+    """
+    Print the speed change of every benchmark against a saved result file
+
+    Args:
+        baseline_path (str): JSON file written by save()
+        results (dict): Results of the current run
+    """
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    print()
+    print(f"Compared to {baseline_path} ({baseline['meta'].get('commit')}):")
+    for name, result in results.items():
+        old = baseline['results'].get(name)
+        if not old or 'ops_per_sec' not in old or 'ops_per_sec' not in result:
+            continue
+        change = result['ops_per_sec'] / old['ops_per_sec'] - 1
+        print(f"{name:<40} {old['ops_per_sec']:>14,.1f} -> {result['ops_per_sec']:>14,.1f} ops/s ({change:+.1%})")
@@ -0,0 +1,32 @@
+import random
+import numpy as np
+
+from benchmarks.harness import benchmark
+from ai.env import BlackjackEnv
+from ai.batch_env import BatchBlackjackEnv
+from ai.agent import QLearningAgent
+from ai.train import run_episode
+
+
+@benchmark('ai.train_episodes', group='macro')
+def train_episodes():
+    random.seed(0)
+    env = BlackjackEnv()
+    agent = QLearningAgent(epsilon=0.1)
+
+    def run():
+        run_episode(env, agent)
+        agent.decay_epsilon()
+    return run, 1
+
+
+@benchmark('ai.batch_env_hands', group='macro')
+def batch_env_hands():
+    num_envs = 10000
+    env = BatchBlackjackEnv(num_envs, seed=0)
+
+    def run():
+        states = env.reset()
+        while not env.done.all():
+            states, _, _ = env.step(np.where(states[:, 0] < 17, 0, 1))
+    return run, num_envs
@@ -0,0 +1,71 @@
+import random
+
+from benchmarks.harness import benchmark
+from models.Card import CARDS
+from models.Deck import Deck
+from models.Hand import Hand
+from ai.env import BlackjackEnv
+from ai.agent import QLearningAgent
+
+
+@benchmark('models.hand_add_card')
+def hand_add_card():
+    hand = Hand()
+    cards = random.Random(0).sample(CARDS, 3)
+
+    def run():
+        hand.clear()
+        for card in cards:
+            hand.add_card(card)
+    return run, len(cards)
+
+
+@benchmark('models.deck_deal')
+def deck_deal():
+    deck = Deck()
+    deck.shuffle()
+    deal = deck.deal
+
+    def run():
+        for _ in range(52):
+            deal()
+        # Rewind the shoe, dealing past its end raises
+        deck.cursor = 0
+    return run, 52
+
+
+@benchmark('ai.env_reset')
+def env_reset():
+    env = BlackjackEnv()
+    return env.reset, 1
+
+
+@benchmark('ai.env_step')
+def env_step():
+    # Reset followed by STAND, which plays out the dealer
+    env = BlackjackEnv()
+
+    def run():
+        env.reset()
+        env.step(1)
+    return run, 1
+
+
+@benchmark('ai.agent_update')
+def agent_update():
+    agent = QLearningAgent()
+    state, next_state = (14, 10, 2, 0), (18, 10, 3, 0)
+
+    def run():
+        agent.update(state, 0, 0, next_state, False)
+    return run, 1
+
+
+@benchmark('ai.agent_act')
+def agent_act():
+    agent = QLearningAgent()
+    state = (17, 10, 3, 1)
+
+    def run():
+        agent.act(state)
+    return run, 1
@@ -0,0 +1,64 @@
+from benchmarks.harness import benchmark
+
+
+_game = None
+
+
+def _get_game():
+    """Create one Game for all rendering benchmarks, with a hand dealt"""
+    global _game
+    if _game is None:
+        from game.Game import Game
+        game = Game()
+        game.resource_manager.wait_until_loaded()
+        game.engine.current_bet = 10
+        game.deck.shuffle()
+        for _ in range(3):
+            game.player.hit(game.deck)
+            game.dealer.hit(game.deck)
+        _game = game
+    return _game
+
+
+@benchmark('game.display_table')
+def display_table():
+    game = _get_game()
+
+    def run():
+        game.display_table(show_dealer=True)
+        game.win.ops.clear()
+    return run, 1
+
+
+@benchmark('ui.draw_text')
+def draw_text():
+    game = _get_game()
+    font = game.resource_manager.fonts['primary_small']
+
+    def run():
+        game.ui_manager.draw_text(f"Chips: {game.player.chips}", font, game.GOLD, 100, 100)
+        game.win.ops.clear()
+    return run, 1
+
+
+@benchmark('game.frames', group='macro')
+def frames():
+    # One idle frame: the table is unchanged, so nothing is redrawn
+    game = _get_game()
+
+    def run():
+        game.display_table(show_dealer=True)
+        game.win.present()
+    return run, 1
+
+
+@benchmark('game.frames_redraw', group='macro')
+def frames_redraw():
+    # One full frame: draw the whole table and push it to the display
+    game = _get_game()
+
+    def run():
+        game.display_table(show_dealer=True)
+        game.win.invalidate()
+        game.win.present()
+    return run, 1
@@ -0,0 +1,42 @@
+import sys
+import os
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+# Headless rendering and audio, must be set before pygame is imported
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import argparse
+import fnmatch
+
+from benchmarks import harness
+from benchmarks import micro, macro, render  # noqa: F401 (register benchmarks)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the Blackjack benchmark suite")
+    parser.add_argument('--filter', default='*', help="Only run benchmarks matching this glob, e.g. 'ai.*'")
+    parser.add_argument('--group', choices=('micro', 'macro'), default=None, help="Only run one group")
+    parser.add_argument('--repeat', type=int, default=5, help="Timed repeats per benchmark (best is kept)")
+    parser.add_argument('--min-time', type=float, default=0.2, help="Minimum seconds per repeat")
+    parser.add_argument('--output', default=None, help="Write results to this JSON file")
+    parser.add_argument('--compare', default=None, help="Compare against a previous JSON result file")
+    parser.add_argument('--list', action='store_true', help="List benchmarks and exit")
+    args = parser.parse_args()
+
+    # Assets are loaded with paths relative to the repository root
+    os.chdir(ROOT)
+
+    names = [name for name, (group, _) in sorted(harness.BENCHMARKS.items())
+             if fnmatch.fnmatch(name, args.filter) and (args.group is None or group == args.group)]
+    if args.list:
+        print('\n'.join(names))
+        sys.exit(0)
+
+    results = harness.run(names, repeat=args.repeat, min_time=args.min_time)
+    if args.output:
+        harness.save(results, args.output)
+    if args.compare:
+        harness.compare(args.compare, results)
@@ -9,6 +9,20 @@ values = {'Two':2, 'Three':3, 'Four':4, 'Five':5, 'Six':6, 'Seven':7, 'Eight':8,
 WINDOW_WIDTH = 1280
 WINDOW_HEIGHT = 720
 
+# Audio: mixer sample rate, buffer size in samples (must be a power of two) and music volume
+MIXER_FREQUENCY = 44100
+MIXER_BUFFER = 512
+MUSIC_VOLUME = 0.5
+
+# Maximum number of rendered text surfaces kept by UIManager
+TEXT_CACHE_SIZE = 256
+
+# Above this many changed regions in a frame, the renderer redraws their union instead
+MAX_DIRTY_RECTS = 16
+
+# Milliseconds between dealer cards, 0 plays the dealer's turn as fast as the frame rate allows
+DEALER_STEP_DELAY = 1000
+
 # Colors
 WHITE = (255, 255, 255)
 GREEN = (0, 128, 0)
@@ -0,0 +1,201 @@
+from entities.Player import Player
+from entities.Dealer import Dealer
+from models.Deck import Deck
+from models.Outcome import Outcome
+
+# Round results from the player's point of view
+PLAYER_WINS = 1
+TIE = 0
+DEALER_WINS = -1
+
+RESULT_MESSAGES = {PLAYER_WINS: 'Player wins!', TIE: 'Tie!', DEALER_WINS: 'Dealer wins!'}
+
+
+class RoundEngine:
+    """
+    Rules of one round of Blackjack, independent of any UI
+
+    A round is: start_round() deals the cards, the player calls player_hit()
+    until player_can_stand() and they choose to stop (or the turn ends on a
+    bust / 5 cards), then the dealer plays with dealer_should_hit() and
+    dealer_hit(), and settle() pays out the bet. play_dealer() runs the whole
+    dealer turn at once. Game drives the same steps one frame at a time.
+
+    Payouts: a winning special case (BlackJack, DoubleAces, 5-Card Charlie)
+    returns 2.5x the bet, any other win 2x, a tie returns the bet.
+    """
+
+    def __init__(self, player=None, dealer=None, deck=None, dealer_ai=None):
+        """
+        Args:
+            player (Player): Player with their chips, Player(100) if None
+            dealer (Dealer): Dealer, a new one if None
+            deck (Deck): Deck to deal from, a new one if None
+            dealer_ai (QLearningAgent): Trained dealer, the rule-based dealer is used if None
+        """
+        self.player = player if player is not None else Player(100)
+        self.dealer = dealer if dealer is not None else Dealer()
+        self.deck = deck if deck is not None else Deck()
+        self.dealer_ai = dealer_ai
+
+        self.current_bet = 0
+        self.player_special_case = Outcome.NONE
+        self.dealer_special_case = Outcome.NONE
+        self.result = None
+
+    @property
+    def result_message(self):
+        return RESULT_MESSAGES.get(self.result, "")
+
+    def is_over(self):
+        return self.result is not None
+
+    def start_round(self, bet):
+        """
+        Take the bet and deal two cards each
+
+        Args:
+            bet (int): Chips to bet
+
+        Returns:
+            bool: True if the round is already over (player's initial special case wins)
+
+        Raises:
+            InsufficientChipsError: If the player does not have enough chips
+        """
+        self.player.bet(amount=bet)
+        self.current_bet = bet
+        self.result = None
+
+        self.player.clear_hand()
+        self.dealer.clear_hand()
+        self.deck.shuffle()
+        self.player.hit(self.deck)
+        self.dealer.hit(self.deck)
+        self.player.hit(self.deck)
+        self.dealer.hit(self.deck)
+
+        self.player_special_case = self.player.hand.outcome()
+        self.dealer_special_case = Outcome.NONE
+
+        if self.player_special_case:
+            # Player wins immediately
+            self.dealer_special_case = self.dealer.hand.outcome()
+            self._pay(PLAYER_WINS)
+            return True
+        return False
+
+    def player_can_stand(self):
+        """The player must hit below 16"""
+        return self.player.get_value() >= 16
+
+    def player_hit(self):
+        """
+        Deal a card to the player
+
+        Returns:
+            bool: True if the player's turn is over (bust or 5 cards)
+        """
+        self.player.hit(self.deck)
+        self.player_special_case = self.player.hand.outcome()
+        return self.player.is_bust() or self.player.hand.num_of_cards() >= 5
+
+    def start_dealer_turn(self):
+        """Reveal the dealer's hand"""
+        self.dealer_special_case = self.dealer.hand.outcome()
+
+    def dealer_state(self):
+        """Dealer state for the AI agent (from dealer's perspective)"""
+        dealer_value = self.dealer.hand.value
+        player_showing = self.player.hand.cards[0].value if len(self.player.hand.cards) > 0 else 0
+        dealer_num_cards = self.dealer.hand.count
+        usable_ace = 1 if self.dealer.hand.aces and dealer_value >= 11 else 0
+
+        return (dealer_value, player_showing, dealer_num_cards, usable_ace)
+
+    def dealer_should_hit(self):
+        """Whether the dealer draws another card, using the AI dealer if there is one"""
+        if self.dealer_special_case or self.dealer.is_bust() or self.dealer.hand.num_of_cards() >= 5:
+            return False
+
+        if self.dealer_ai is not None:
+            # The must-hit rules are baked into the compiled policy
+            return self.dealer_ai.act(self.dealer_state()) == 0
+
+        # Rule-based dealer
+        if self.player.is_bust():
+            return self.dealer.get_value() < 17
+        elif not self.player_special_case:
+            return self.dealer.get_value() <= self.player.get_value()
+        else:
+            return True
+
+    def dealer_hit(self):
+        """Deal a card to the dealer"""
+        self.dealer.hit(self.deck)
+        self.dealer_special_case = self.dealer.hand.outcome()
+
+    def play_dealer(self):
+        """
+        Play the dealer's whole turn and settle the round
+
+        Returns:
+            int: PLAYER_WINS, TIE or DEALER_WINS
+        """
+        self.start_dealer_turn()
+        while self.dealer_should_hit():
+            self.dealer_hit()
+        return self.settle()
+
+    def settle(self):
+        """
+        Compare the final hands and pay out the bet
+
+        Returns:
+            int: PLAYER_WINS, TIE or DEALER_WINS
+        """
+        if self.dealer.hand.num_of_cards() == 2 and self.dealer_special_case:
+            # Dealer's initial special case wins immediately
+            return self._pay(DEALER_WINS)
+
+        player_val = self.player.get_value()
+        dealer_val = self.dealer.get_value()
+
+        player_is_bust = self.player.is_bust()
+        dealer_is_bust = self.dealer.is_bust()
+
+        player_has_5_charlie = self.player_special_case == Outcome.FIVE_CARD_CHARLIE
+        dealer_has_5_charlie = self.dealer_special_case == Outcome.FIVE_CARD_CHARLIE
+
+        # Bust cases
+        if player_is_bust and dealer_is_bust:
+            result = TIE
+        elif player_is_bust:
+            result = DEALER_WINS
+        elif dealer_is_bust:
+            result = PLAYER_WINS
+
+        # 5-Card Charlie cases, the lower value wins
+        elif player_has_5_charlie and dealer_has_5_charlie:
+            result = (player_val < dealer_val) - (player_val > dealer_val)
+        elif player_has_5_charlie:
+            result = PLAYER_WINS
+        elif dealer_has_5_charlie:
+            result = DEALER_WINS
+
+        # Normal cases
+        else:
+            result = (player_val > dealer_val) - (player_val < dealer_val)
+
+        return self._pay(result)
+
+    def _pay(self, result):
+        if result == PLAYER_WINS:
+            if self.player_special_case:
+                self.player.earn(int(2.5 * self.current_bet))
+            else:
+                self.player.earn(int(2 * self.current_bet))
+        elif result == TIE:
+            self.player.earn(int(self.current_bet))
+        self.result = result
+        return result
@@ -0,0 +1,241 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from entities.Player import Player, InsufficientChipsError
+from game.RoundEngine import RoundEngine
+from models.Outcome import describe
+from ai.agent import QLearningAgent
+import argparse
+import asyncio
+import json
+
+# Longest request line accepted from a client, in bytes
+MAX_LINE = 4096
+
+
+class InvalidCommandError(Exception):
+    """Raised when a client command cannot be played in the current state"""
+    pass
+
+
+class Table:
+    """
+    One player at one table, driven by client commands
+
+    Commands are JSON objects with a "cmd" field:
+    - {"cmd": "bet", "amount": 10}: start a round
+    - {"cmd": "hit"} / {"cmd": "stand"}: play the player's turn
+    - {"cmd": "state"}: current table state
+    Every command is answered with the table state (see state()).
+    """
+
+    def __init__(self, table_id, chips=100, dealer_ai=None):
+        """
+        Args:
+            table_id (int): Table number, reported in the state
+            chips (int): Starting chips of the player
+            dealer_ai (QLearningAgent): Trained dealer shared by the tables, rule-based dealer if None
+        """
+        self.table_id = table_id
+        self.engine = RoundEngine(Player(chips), dealer_ai=dealer_ai)
+        self.in_round = False
+        self.rounds = 0
+
+    def handle(self, request):
+        """
+        Play one command
+
+        Args:
+            request (dict): Decoded client command
+
+        Returns:
+            dict: Table state after the command
+
+        Raises:
+            InvalidCommandError: If the command is unknown or not allowed now
+        """
+        cmd = request.get('cmd')
+        engine = self.engine
+
+        if cmd == 'bet':
+            if self.in_round:
+                raise InvalidCommandError("Round in progress")
+            amount = request.get('amount')
+            # bool is a subclass of int, JSON true must not bet 1 chip
+            if isinstance(amount, bool) or not isinstance(amount, int) or amount <= 0:
+                raise InvalidCommandError("Bet amount must be a positive integer")
+            try:
+                round_over = engine.start_round(amount)
+            except InsufficientChipsError:
+                raise InvalidCommandError("Not enough chips")
+            self.rounds += 1
+            self.in_round = not round_over
+        elif cmd == 'hit':
+            if not self.in_round:
+                raise InvalidCommandError("No round in progress")
+            if engine.player_hit():
+                self._finish_round()
+        elif cmd == 'stand':
+            if not self.in_round:
+                raise InvalidCommandError("No round in progress")
+            if not engine.player_can_stand():
+                raise InvalidCommandError("Must HIT (Value < 16)")
+            self._finish_round()
+        elif cmd != 'state':
+            raise InvalidCommandError(f"Unknown command: {cmd}")
+
+        return self.state()
+
+    def _finish_round(self):
+        self.engine.play_dealer()
+        self.in_round = False
+
+    def state(self):
+        """Table state as sent to the client, the dealer's hole card is hidden during the round"""
+        engine = self.engine
+        player, dealer = engine.player, engine.dealer
+        dealer_cards = [str(card) for card in dealer.hand.cards]
+        if self.in_round:
+            dealer_cards = dealer_cards[:1] + ['Hidden'] * (len(dealer_cards) - 1)
+
+        return {
+            'ok': True,
+            'table': self.table_id,
+            'phase': 'player' if self.in_round else ('over' if engine.is_over() else 'betting'),
+            'chips': player.chips,
+            'bet': engine.current_bet,
+            'player': {
+                'cards': [str(card) for card in player.hand.cards],
+                'value': player.get_value(),
+                'special': describe(engine.player_special_case, player.get_value()),
+            },
+            'dealer': {
+                'cards': dealer_cards,
+                'value': None if self.in_round else dealer.get_value(),
+                'special': None if self.in_round else describe(engine.dealer_special_case, dealer.get_value()),
+            },
+            'can_stand': self.in_round and engine.player_can_stand(),
+            'result': None if self.in_round else (engine.result_message or None),
+        }
+
+
+class TableServer:
+    """
+    Hosts many tables on one asyncio event loop, one table per connection
+
+    Clients send one JSON command per line and receive one JSON state per line.
+    A round is played in microseconds, so commands are handled inline without
+    blocking other tables.
+    """
+
+    def __init__(self, chips=100, dealer_ai=None, max_tables=1000, reload_interval=5.0):
+        """
+        Args:
+            chips (int): Starting chips of each player
+            dealer_ai (QLearningAgent): Trained dealer shared by every table (optional)
+            max_tables (int): Connections above this are refused
+            reload_interval (float): Seconds between checks for a replaced model file, 0 to never reload
+        """
+        self.chips = chips
+        self.dealer_ai = dealer_ai
+        self.max_tables = max_tables
+        self.reload_interval = reload_interval
+        self.tables = {}
+        self._next_id = 0
+        self._reloader = None
+
+    async def handle_client(self, reader, writer):
+        """Serve one connection until the client quits or disconnects"""
+        if len(self.tables) >= self.max_tables:
+            await self._send(writer, {'ok': False, 'error': "Server full"})
+            writer.close()
+            return
+
+        self._next_id += 1
+        table = self.tables[self._next_id] = Table(self._next_id, self.chips, self.dealer_ai)
+        try:
+            await self._send(writer, table.state())
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    await self._send(writer, {'ok': False, 'error': "Line too long"})
+                    break
+                if not line:
+                    break
+                try:
+                    request = json.loads(line.decode('utf-8'))
+                    if not isinstance(request, dict):
+                        raise InvalidCommandError("Command must be a JSON object")
+                    if request.get('cmd') == 'quit':
+                        break
+                    response = table.handle(request)
+                except UnicodeDecodeError:
+                    response = {'ok': False, 'error': "Command must be UTF-8 encoded"}
+                except (json.JSONDecodeError, InvalidCommandError) as e:
+                    response = {'ok': False, 'error': str(e)}
+                except RecursionError:
+                    response = {'ok': False, 'error': "Command is nested too deeply"}
+                await self._send(writer, response)
+        except ConnectionError:
+            pass
+        finally:
+            del self.tables[table.table_id]
+            writer.close()
+
+    @staticmethod
+    async def _send(writer, message):
+        writer.write(json.dumps(message).encode() + b'\n')
+        await writer.drain()
+
+    async def reload_model(self):
+        """Periodically pick up a new dealer model, tables use it from their next decision"""
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            self.dealer_ai.reload_if_changed()
+
+    async def serve(self, host='127.0.0.1', port=8765, unix_path=None):
+        """Accept connections forever, on a Unix socket if unix_path is given, otherwise on TCP"""
+        if self.dealer_ai is not None and self.reload_interval > 0:
+            # Keep a reference so the task is not garbage collected
+            self._reloader = asyncio.create_task(self.reload_model())
+        try:
+            if unix_path:
+                server = await asyncio.start_unix_server(self.handle_client, path=unix_path, limit=MAX_LINE)
+                print(f"Serving tables on {unix_path}")
+            else:
+                server = await asyncio.start_server(self.handle_client, host, port, limit=MAX_LINE)
+                print(f"Serving tables on {host}:{port}")
+            async with server:
+                await server.serve_forever()
+        finally:
+            if self._reloader is not None:
+                self._reloader.cancel()
+                self._reloader = None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Host Blackjack tables over a line-delimited JSON protocol")
+    parser.add_argument('--host', default='127.0.0.1', help="TCP address to listen on")
+    parser.add_argument('--port', type=int, default=8765, help="TCP port to listen on")
+    parser.add_argument('--unix', default=None, help="Listen on this Unix socket instead of TCP")
+    parser.add_argument('--chips', type=int, default=100, help="Starting chips of each player")
+    parser.add_argument('--max-tables', type=int, default=1000, help="Maximum number of concurrent tables")
+    parser.add_argument('--model', default=os.path.join('ai', 'data', 'q_table.npy'), help="Q-table of the AI dealer")
+    parser.add_argument('--dealer', choices=('ai', 'rules'), default='ai', help="AI dealer (falls back to rules without a model) or rule-based dealer")
+    parser.add_argument('--reload-interval', type=float, default=5.0, help="Seconds between checks for a replaced model file")
+    args = parser.parse_args()
+
+    dealer_ai = None
+    if args.dealer == 'ai':
+        agent = QLearningAgent()
+        if agent.load(args.model, mmap=True):
+            dealer_ai = agent
+
+    server = TableServer(chips=args.chips, dealer_ai=dealer_ai, max_tables=args.max_tables,
+                         reload_interval=args.reload_interval)
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
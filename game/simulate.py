@@ -0,0 +1,135 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from entities.Player import Player
+from game.RoundEngine import RoundEngine, PLAYER_WINS, TIE, DEALER_WINS
+from ai.agent import QLearningAgent
+import argparse
+import random
+import time
+
+
+def threshold_strategy(stand_on):
+    """Player strategy: hit until the hand value reaches stand_on"""
+    def strategy(engine):
+        return engine.player.get_value() < stand_on
+    return strategy
+
+
+def random_strategy(engine):
+    """Player strategy: hit or stand at random"""
+    return random.random() < 0.5
+
+
+def play_round(engine, bet, strategy):
+    """
+    Play one full round without a UI
+
+    Args:
+        engine (RoundEngine): Round engine
+        bet (int): Chips to bet
+        strategy (callable): strategy(engine) -> True to hit, only asked when the player may stand
+
+    Returns:
+        int: PLAYER_WINS, TIE or DEALER_WINS
+    """
+    if engine.start_round(bet):
+        return engine.result
+    while not engine.player_can_stand() or strategy(engine):
+        if engine.player_hit():
+            break
+    return engine.play_dealer()
+
+
+def simulate(num_rounds=10000, chips=100, bet=10, strategy=None, dealer_ai=None, rebuy=True):
+    """
+    Play many rounds headless and collect payout statistics
+
+    Args:
+        num_rounds (int): Number of rounds to play
+        chips (int): Starting bankroll
+        bet (int): Chips bet per round, capped by the bankroll
+        strategy (callable): Player strategy, stands on 17 if None
+        dealer_ai (QLearningAgent): Trained dealer, the rule-based dealer is used if None
+        rebuy (bool): Restart with a fresh bankroll when the player is broke, instead of stopping
+
+    Returns:
+        dict: Round counts, chips wagered and returned, rebuys and timing
+    """
+    strategy = strategy if strategy is not None else threshold_strategy(17)
+    engine = RoundEngine(Player(chips), dealer_ai=dealer_ai)
+    stats = {'rounds': 0, 'wins': 0, 'ties': 0, 'losses': 0, 'specials': 0,
+             'wagered': 0, 'returned': 0, 'rebuys': 0, 'final_chips': chips}
+
+    start_time = time.time()
+    for _ in range(num_rounds):
+        if engine.player.chips == 0:
+            if not rebuy:
+                break
+            engine.player.chips = chips
+            stats['rebuys'] += 1
+
+        stake = min(bet, engine.player.chips)
+        before = engine.player.chips
+        result = play_round(engine, stake, strategy)
+
+        stats['rounds'] += 1
+        stats['wagered'] += stake
+        stats['returned'] += engine.player.chips - before + stake
+        if result == PLAYER_WINS:
+            stats['wins'] += 1
+            stats['specials'] += bool(engine.player_special_case)
+        elif result == TIE:
+            stats['ties'] += 1
+        elif result == DEALER_WINS:
+            stats['losses'] += 1
+
+    stats['final_chips'] = engine.player.chips
+    stats['elapsed'] = time.time() - start_time
+    return stats
+
+
+def print_report(stats):
+    rounds = max(stats['rounds'], 1)
+    print("=" * 60)
+    print("SIMULATION RESULTS")
+    print("=" * 60)
+    print(f"Rounds played: {stats['rounds']:,} ({stats['rounds'] / max(stats['elapsed'], 1e-9):,.0f} rounds/sec)")
+    print(f"Player wins: {stats['wins']:,} ({stats['wins'] / rounds * 100:.2f}%), "
+          f"{stats['specials']:,} with a special case")
+    print(f"Ties: {stats['ties']:,} ({stats['ties'] / rounds * 100:.2f}%)")
+    print(f"Dealer wins: {stats['losses']:,} ({stats['losses'] / rounds * 100:.2f}%)")
+    print(f"Chips wagered: {stats['wagered']:,}, returned: {stats['returned']:,}")
+    print(f"Payout rate: {stats['returned'] / max(stats['wagered'], 1) * 100:.2f}% of wagered chips")
+    print(f"Final chips: {stats['final_chips']:,}, rebuys: {stats['rebuys']:,}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play Blackjack rounds headless with a scripted player")
+    parser.add_argument('--rounds', type=int, default=10000, help="Number of rounds to play")
+    parser.add_argument('--chips', type=int, default=100, help="Starting bankroll")
+    parser.add_argument('--bet', type=int, default=10, help="Chips bet per round")
+    parser.add_argument('--strategy', choices=('threshold', 'random'), default='threshold', help="Player strategy")
+    parser.add_argument('--stand-on', type=int, default=17, help="Hand value the threshold strategy stands on")
+    parser.add_argument('--dealer', choices=('ai', 'rules'), default='ai', help="AI dealer (falls back to rules without a model) or rule-based dealer")
+    parser.add_argument('--model', default=os.path.join('ai', 'data', 'q_table.npy'), help="Q-table of the AI dealer")
+    parser.add_argument('--no-rebuy', action='store_true', help="Stop when the player is broke")
+    parser.add_argument('--seed', type=int, default=None, help="Random seed")
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    dealer_ai = None
+    if args.dealer == 'ai':
+        agent = QLearningAgent()
+        if agent.load(args.model):
+            dealer_ai = agent
+    print(f"Dealer: {'AI (' + args.model + ')' if dealer_ai is not None else 'rule-based'}")
+
+    strategy = threshold_strategy(args.stand_on) if args.strategy == 'threshold' else random_strategy
+    stats = simulate(num_rounds=args.rounds, chips=args.chips, bet=args.bet, strategy=strategy,
+                     dealer_ai=dealer_ai, rebuy=not args.no_rebuy)
+    print_report(stats)
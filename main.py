@@ -1,5 +1,13 @@
 from game.Game import Game
+from utils.profiler import enable_from_option
+import argparse
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Play Blackjack against the AI dealer")
+    parser.add_argument('--profile', nargs='?', const='1', default=None,
+                        help="Time hot paths and print a report on exit; a path also saves cProfile stats there")
+    args = parser.parse_args()
+    enable_from_option(args.profile)
+
     new_game = Game()
-    new_game.play()
\ No newline at end of file
+    new_game.play()
@@ -0,0 +1,107 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.Card import CARDS
+import pygame
+import argparse
+import json
+import time
+
+CARD_SIZE = (100, 145)
+
+ATLAS_IMAGE = os.path.join('assets', 'cards', 'atlas.png')
+ATLAS_INDEX = os.path.join('assets', 'cards', 'atlas.json')
+
+# Cards per atlas row, the card back takes the first slot after the 52 faces
+ATLAS_COLUMNS = 13
+
+RANK_FILES = {
+    'Two': '2', 'Three': '3', 'Four': '4', 'Five': '5',
+    'Six': '6', 'Seven': '7', 'Eight': '8', 'Nine': '9',
+    'Ten': '10', 'Jack': 'jack', 'Queen': 'queen',
+    'King': 'king', 'Ace': 'ace'
+}
+
+
+def card_image_path(card):
+    """Path of the separate image of a card face"""
+    rank_file = RANK_FILES[card.rank]
+    return os.path.join('assets', 'cards', rank_file, f"{rank_file}_of_{card.suit.lower()}.png")
+
+
+def card_back_path():
+    return os.path.join('assets', 'cards', 'cardback.png')
+
+
+def build_atlas(image_path=ATLAS_IMAGE, index_path=ATLAS_INDEX, card_size=CARD_SIZE):
+    """
+    Pack every card face and the card back, pre-scaled, into one image
+
+    The index stores the top left corner of each card in the atlas, faces in
+    Card.id order.
+
+    Args:
+        image_path (str): Where to save the atlas image
+        index_path (str): Where to save the JSON index
+        card_size (tuple): (width, height) of each card
+    """
+    width, height = card_size
+    sources = [card_image_path(card) for card in CARDS] + [card_back_path()]
+    rows = (len(sources) + ATLAS_COLUMNS - 1) // ATLAS_COLUMNS
+    atlas = pygame.Surface((ATLAS_COLUMNS * width, rows * height), pygame.SRCALPHA)
+
+    positions = []
+    for slot, path in enumerate(sources):
+        position = ((slot % ATLAS_COLUMNS) * width, (slot // ATLAS_COLUMNS) * height)
+        image = pygame.transform.scale(pygame.image.load(path).convert_alpha(), card_size)
+        atlas.blit(image, position)
+        positions.append(position)
+
+    os.makedirs(os.path.dirname(image_path) or '.', exist_ok=True)
+    pygame.image.save(atlas, image_path)
+    with open(index_path, 'w') as f:
+        json.dump({'card_size': list(card_size), 'cards': positions[:-1], 'back': positions[-1]}, f)
+    print(f"Card atlas saved to {image_path} and {index_path}")
+
+
+def load_atlas(image, index_path=ATLAS_INDEX, card_size=CARD_SIZE):
+    """
+    Cut a loaded atlas image into card surfaces
+
+    Args:
+        image (pygame.Surface): Atlas image
+        index_path (str): JSON index written by build_atlas
+        card_size (tuple): Expected (width, height) of each card
+
+    Returns:
+        tuple: (list of 52 face surfaces indexed by Card.id, card back surface),
+            None if the index is missing or was built for another card size
+    """
+    if not os.path.exists(index_path):
+        return None
+    with open(index_path) as f:
+        index = json.load(f)
+    if tuple(index['card_size']) != tuple(card_size) or len(index['cards']) != len(CARDS):
+        print(f"Card atlas {index_path} is out of date, rebuild it with python managers/CardAtlas.py")
+        return None
+
+    faces = [image.subsurface(pygame.Rect(position, card_size)) for position in index['cards']]
+    back = image.subsurface(pygame.Rect(index['back'], card_size))
+    return faces, back
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pack the card images into one pre-scaled atlas")
+    parser.add_argument('--image', default=ATLAS_IMAGE, help="Where to save the atlas image")
+    parser.add_argument('--index', default=ATLAS_INDEX, help="Where to save the atlas index")
+    args = parser.parse_args()
+
+    # convert_alpha needs a display mode, a hidden 1x1 window is enough
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+
+    start_time = time.time()
+    build_atlas(args.image, args.index)
+    print(f"Built in {time.time() - start_time:.3f}s")
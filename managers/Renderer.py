@@ -0,0 +1,90 @@
+import pygame
+from collections import Counter
+from config import settings
+
+class Renderer:
+    """
+    Dirty-rectangle renderer for the display
+
+    Drawing calls are recorded into a display list instead of being drawn
+    right away. present() compares the list with the previous frame: if
+    nothing changed the frame is skipped, otherwise only the regions covered
+    by added or removed draw calls are redrawn (in order, clipped to those
+    regions) and pushed to the screen.
+
+    Surfaces are compared by identity, so a drawn surface must not be modified
+    in place afterwards; call invalidate() if the screen has to be redrawn
+    completely, e.g. after drawing to the display directly.
+    """
+
+    def __init__(self, window):
+        """
+        Args:
+            window (pygame.Surface): Display surface returned by pygame.display.set_mode
+        """
+        self.window = window
+        self.rect = window.get_rect()
+        self.ops = []
+        self.previous = None
+        self.frames_drawn = 0
+        self.frames_skipped = 0
+
+    def blit(self, surface, dest):
+        """Draw a surface with its top left corner at dest (a position or a Rect)"""
+        rect = surface.get_rect(topleft=(dest[0], dest[1]))
+        self.ops.append(('blit', surface, (rect.x, rect.y, rect.w, rect.h)))
+        return rect
+
+    def draw_rect(self, color, rect, width=0, border_radius=0):
+        """Draw a rectangle, same arguments as pygame.draw.rect"""
+        rect = pygame.Rect(rect)
+        self.ops.append(('rect', tuple(color), (rect.x, rect.y, rect.w, rect.h), width, border_radius))
+        return rect
+
+    def invalidate(self):
+        """Redraw the whole screen on the next present()"""
+        self.previous = None
+
+    def present(self):
+        """
+        Draw the changes since the previous frame and update the screen
+
+        Returns:
+            bool: False if nothing changed and the frame was skipped
+        """
+        ops, self.ops = self.ops, []
+        if ops == self.previous:
+            self.frames_skipped += 1
+            return False
+
+        if self.previous is None:
+            dirty = [self.rect]
+        else:
+            # Regions of draw calls that appeared or disappeared
+            changed = (Counter(ops) - Counter(self.previous)) + (Counter(self.previous) - Counter(ops))
+            dirty = [pygame.Rect(op[2]).clip(self.rect) for op in changed]
+            dirty = [rect for rect in dirty if rect.w and rect.h] or [self.rect]
+            if len(dirty) > settings.MAX_DIRTY_RECTS:
+                dirty = [dirty[0].unionall(dirty[1:])]
+
+        for region in dirty:
+            self._draw(ops, region)
+        self.window.set_clip(None)
+        pygame.display.update(dirty)
+
+        self.previous = ops
+        self.frames_drawn += 1
+        return True
+
+    def _draw(self, ops, region):
+        """Replay the display list clipped to one region"""
+        window = self.window
+        window.set_clip(region)
+        window.fill(settings.BLACK, region)
+        for op in ops:
+            if not region.colliderect(op[2]):
+                continue
+            if op[0] == 'blit':
+                window.blit(op[1], op[2][:2])
+            else:
+                pygame.draw.rect(window, op[1], op[2], op[3], border_radius=op[4])
@@ -1,105 +1,274 @@
 import pygame
 import os
+import queue
+import threading
+import time
 from config import settings
+from managers.CardAtlas import CARD_SIZE, ATLAS_IMAGE, ATLAS_INDEX, card_image_path, card_back_path, load_atlas
+
+# Process-wide asset cache shared by every ResourceManager, keyed by (kind, path, options)
+_assets = {}
+
+
+def decode_image(path, size=None, alpha=False):
+    """
+    Decode and scale an image into raw pixels, safe to call from a worker thread
+
+    Args:
+        path (str): Image file
+        size (tuple): (width, height) to scale to (optional)
+        alpha (bool): Keep per-pixel transparency
+
+    Returns:
+        tuple: (pixel bytes, (width, height), 'RGBA' or 'RGB') for load_image
+    """
+    image = pygame.image.load(path)
+    if size is not None:
+        image = pygame.transform.scale(image, size)
+    pixel_format = 'RGBA' if alpha else 'RGB'
+    return pygame.image.tobytes(image, pixel_format), image.get_size(), pixel_format
+
+
+def load_image(path, size=None, alpha=False, pixels=None):
+    """
+    Load an image once per process, scaled and converted to the display's pixel format
+
+    Args:
+        path (str): Image file
+        size (tuple): (width, height) to scale to (optional)
+        alpha (bool): Keep per-pixel transparency
+        pixels (tuple): The image already decoded by decode_image (optional)
+
+    Returns:
+        pygame.Surface: Shared surface, must not be modified
+    """
+    key = ('image', path, size, alpha)
+    if key not in _assets:
+        if pixels is None:
+            image = pygame.image.load(path)
+            if size is not None:
+                image = pygame.transform.scale(image, size)
+        else:
+            image = pygame.image.frombuffer(*pixels)
+        # Converting needs a display mode; without one the surface is kept as loaded
+        if pygame.display.get_surface() is not None:
+            image = image.convert_alpha() if alpha else image.convert()
+        _assets[key] = image
+    return _assets[key]
+
+
+def load_font(path, size):
+    """Load a font once per process"""
+    key = ('font', path, size)
+    if key not in _assets:
+        _assets[key] = pygame.font.Font(path, size)
+    return _assets[key]
+
+
+def decode_sound(path):
+    """Decode a sound file into raw samples in the mixer's format, safe to call from a worker thread"""
+    return pygame.mixer.Sound(path).get_raw()
+
+
+def load_sound(path, volume=1.0, samples=None):
+    """Load a sound once per process, from the samples of decode_sound if it was already decoded"""
+    key = ('sound', path)
+    if key not in _assets:
+        _assets[key] = pygame.mixer.Sound(path) if samples is None else pygame.mixer.Sound(buffer=samples)
+    sound = _assets[key]
+    sound.set_volume(volume)
+    return sound
+
+
+def clear_assets():
+    """Drop every cached asset, e.g. before the display mode changes"""
+    _assets.clear()
+
+
+def _decode_item(item):
+    """Raw pixels or samples of an asset, see decode_image and decode_sound"""
+    kind, key, path, option = item
+    if kind == 'image':
+        return decode_image(path, option, alpha=_has_alpha(item))
+    if kind == 'atlas':
+        return decode_image(path, alpha=True)
+    return decode_sound(path)
+
+
+def _has_alpha(item):
+    return item[0] == 'atlas' or item[1] == 'card_back'
+
+
+def _decode_files(items, results):
+    """
+    Worker thread: decode every item, the main thread only wraps the result
+
+    pygame releases the GIL while decoding files, so frames keep being drawn.
+    Every item gets a result, errors of any kind are handed to the main thread
+    to be reported there, otherwise loading would never finish.
+    """
+    for item in items:
+        try:
+            results.put((item, _decode_item(item)))
+        except Exception as e:
+            results.put((item, e))
+
 
 class ResourceManager:
-    def __init__(self):
-        self.card_images = {}
+    """
+    Fonts, images and sounds of the game
+
+    Only what the welcome screen needs (fonts and background) is loaded up
+    front. The rest is loaded synchronously, or, with background=True, decoded
+    into raw pixels and samples by a worker thread while the main thread keeps
+    drawing frames and calls update_loading() to wrap what has been decoded so
+    far into surfaces and sounds. An asset that cannot be loaded is reported
+    and skipped.
+    """
+
+    def __init__(self, background=False):
+        """
+        Args:
+            background (bool): Read the remaining assets on a worker thread
+        """
+        # Card faces indexed by Card.id, from the atlas or loaded on first use (see get_card_image)
+        self.card_images = [None] * 52
+        self._missing_cards = set()
         self.fonts = {}
         self.images = {}
         self.sounds = {}
-        self.load_resources()
+        self._pending = []
+        self._loaded = 0
+        self._results = queue.Queue()
+        # Music is streamed from disk by pygame.mixer.music instead of being decoded into memory
+        self.music = {'bg_music': os.path.join('assets', 'sounds', 'background', 'bg.mp3')}
+        self.load_resources(background)
 
-    def load_resources(self):
+    def load_resources(self, background=False):
         # Load fonts
         primary_font_path = os.path.join('assets', 'fonts', 'primary-font.ttf')
         chip_font_path = os.path.join('assets', 'fonts', 'chips-font.ttf')
-        self.fonts['primary_large'] = pygame.font.Font(primary_font_path, 48)
-        self.fonts['primary_medium'] = pygame.font.Font(primary_font_path, 36)
-        self.fonts['primary_small'] = pygame.font.Font(primary_font_path, 24)
-        self.fonts['chips'] = pygame.font.Font(chip_font_path, 24)
-
-        # Load images
-        bg_path = os.path.join('assets', 'bg.jpg')
-        self.images['bg'] = pygame.image.load(bg_path)
-        self.images['bg'] = pygame.transform.scale(self.images['bg'], (settings.WINDOW_WIDTH, settings.WINDOW_HEIGHT))
-
-        tutorial_path = os.path.join('assets', 'tutorial.jpg')
-        self.images['tutorial_img'] = pygame.image.load(tutorial_path)
-        self.images['tutorial_img'] = pygame.transform.scale(self.images['tutorial_img'], (settings.WINDOW_WIDTH, settings.WINDOW_HEIGHT))
-
-        card_back_path = os.path.join('assets', 'cards', 'cardback.png')
-        self.images['card_back'] = pygame.image.load(card_back_path)
-        self.images['card_back'] = pygame.transform.scale(self.images['card_back'], (100, 145))
-
-        # Load card images
-        self._load_card_images()
-
-        # Load sounds
-        # Background music
-        bg_music_path = os.path.join('assets', 'sounds', 'background', 'bg.mp3')
-        bg_music = pygame.mixer.Sound(bg_music_path)
-        bg_music.set_volume(0.5)
-        self.sounds['bg_music'] = bg_music
-
-        # Button click
-        button_click_path = os.path.join('assets', 'sounds', 'button_press.mp3')
-        button_click = pygame.mixer.Sound(button_click_path)
-        button_click.set_volume(0.7)
-        self.sounds['button_click'] = button_click
-
-        # Hit card
-        hit_card_path = os.path.join('assets', 'sounds', 'hit_card.mp3')
-        hit_card = pygame.mixer.Sound(hit_card_path)
-        hit_card.set_volume(0.7)
-        self.sounds['hit_card'] = hit_card
-
-        # Win sound
-        win_sound_path = os.path.join('assets', 'sounds', 'win.wav')
-        win_sound = pygame.mixer.Sound(win_sound_path)
-        win_sound.set_volume(0.7)
-        self.sounds['win_sound'] = win_sound
-
-        # Lose sound
-        lose_sound_path = os.path.join('assets', 'sounds', 'lose.wav')
-        lose_sound = pygame.mixer.Sound(lose_sound_path)
-        lose_sound.set_volume(0.7)
-        self.sounds['lose_sound'] = lose_sound
-
-        # Tie sound
-        tie_sound_path = os.path.join('assets', 'sounds', 'tie.wav')
-        tie_sound = pygame.mixer.Sound(tie_sound_path)
-        tie_sound.set_volume(0.7)
-        self.sounds['tie_sound'] = tie_sound
-
-    def _load_card_images(self):
-        """Load all card images from assets folder"""
-        rank_map = {
-            'Two': '2', 'Three': '3', 'Four': '4', 'Five': '5',
-            'Six': '6', 'Seven': '7', 'Eight': '8', 'Nine': '9',
-            'Ten': '10', 'Jack': 'jack', 'Queen': 'queen', 
-            'King': 'king', 'Ace': 'ace'
-        }
-        
-        suit_map = {
-            'Hearts': 'hearts',
-            'Diamonds': 'diamonds',
-            'Spades': 'spades',
-            'Clubs': 'clubs'
-        }
-        
-        for rank in settings.ranks:
-            for suit in settings.suits:
-                rank_folder = rank_map[rank]
-                file_name = f"{rank_map[rank]}_of_{suit_map[suit]}.png"
-                path = os.path.join('assets', 'cards', rank_folder, file_name)
-                
-                try:
-                    img = pygame.image.load(path)
-                    img = pygame.transform.scale(img, (100, 145))
-                    self.card_images[f"{rank} of {suit}"] = img
-                except:
-                    print(f"Error loading: {path}")
+        self.fonts['primary_large'] = load_font(primary_font_path, 48)
+        self.fonts['primary_medium'] = load_font(primary_font_path, 36)
+        self.fonts['primary_small'] = load_font(primary_font_path, 24)
+        self.fonts['chips'] = load_font(chip_font_path, 24)
+
+        # Load background, needed by the first frame
+        screen_size = (settings.WINDOW_WIDTH, settings.WINDOW_HEIGHT)
+        self.images['bg'] = load_image(os.path.join('assets', 'bg.jpg'), screen_size)
+
+        self._pending = self._asset_items()
+        self._loaded = 0
+        if background:
+            thread = threading.Thread(target=_decode_files, args=(list(self._pending), self._results), daemon=True)
+            thread.start()
+        else:
+            for item in self._pending:
+                self._load_item(item)
+            self._loaded = len(self._pending)
+
+    def _asset_items(self):
+        """(kind, key, path, option) of every asset loaded after the first frame"""
+        screen_size = (settings.WINDOW_WIDTH, settings.WINDOW_HEIGHT)
+        items = [('image', 'tutorial_img', os.path.join('assets', 'tutorial.jpg'), screen_size)]
+        if os.path.exists(ATLAS_IMAGE):
+            items.append(('atlas', None, ATLAS_IMAGE, None))
+        else:
+            items.append(('image', 'card_back', card_back_path(), CARD_SIZE))
+
+        # Sound effects and their volumes
+        items += [
+            ('sound', 'button_click', os.path.join('assets', 'sounds', 'button_press.mp3'), 0.7),
+            ('sound', 'hit_card', os.path.join('assets', 'sounds', 'hit_card.mp3'), 0.7),
+            ('sound', 'win_sound', os.path.join('assets', 'sounds', 'win.wav'), 0.7),
+            ('sound', 'lose_sound', os.path.join('assets', 'sounds', 'lose.wav'), 0.7),
+            ('sound', 'tie_sound', os.path.join('assets', 'sounds', 'tie.wav'), 0.7),
+        ]
+        return items
+
+    def _load_item(self, item, decoded=None):
+        """
+        Create the surface or sound of an asset, on the main thread
+
+        Args:
+            item (tuple): (kind, key, path, option) from _asset_items
+            decoded: Result of _decode_item, or the error raised decoding it (optional, loads from file if None)
+        """
+        kind, key, path, option = item
+        try:
+            if isinstance(decoded, Exception):
+                # Whatever failed on the worker thread, the asset is skipped
+                raise OSError(f"{type(decoded).__name__}: {decoded}")
+            if kind == 'image':
+                self.images[key] = load_image(path, option, alpha=_has_alpha(item), pixels=decoded)
+            elif kind == 'atlas':
+                self._load_card_atlas(load_image(path, alpha=True, pixels=decoded))
+            else:
+                self.sounds[key] = load_sound(path, option, samples=decoded)
+        except (OSError, pygame.error) as e:
+            print(f"Error loading: {path} ({e})")
+            if kind == 'atlas':
+                # Card faces are then loaded on first use, the back right away
+                self._load_item(('image', 'card_back', card_back_path(), CARD_SIZE))
+
+    def update_loading(self, budget=0.008):
+        """
+        Decode assets read by the worker thread, for at most budget seconds
+
+        Returns:
+            bool: True once every asset is loaded
+        """
+        deadline = time.perf_counter() + budget
+        while self._loaded < len(self._pending) and time.perf_counter() < deadline:
+            try:
+                item, data = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._load_item(item, data)
+            self._loaded += 1
+        return self.is_loaded()
+
+    def wait_until_loaded(self):
+        """Block until every asset is loaded"""
+        while self._loaded < len(self._pending):
+            self._load_item(*self._results.get())
+            self._loaded += 1
+
+    def is_loaded(self):
+        return self._loaded == len(self._pending)
+
+    def load_progress(self):
+        """Fraction of the assets loaded so far, in [0, 1]"""
+        return self._loaded / len(self._pending) if self._pending else 1.0
+
+    def _load_card_atlas(self, image):
+        """Cut every card from the atlas image, falling back to separate images"""
+        atlas = load_atlas(image, ATLAS_INDEX, CARD_SIZE)
+        if atlas is None:
+            self.images['card_back'] = load_image(card_back_path(), CARD_SIZE, alpha=True)
+            return
+        faces, self.images['card_back'] = atlas
+        self.card_images[:] = faces
+
+    def get_card_image(self, card):
+        """
+        Image of a card, loaded on first use if there is no atlas
+
+        Args:
+            card (Card): Card to draw
+
+        Returns:
+            pygame.Surface: Card image, None if it could not be loaded
+        """
+        image = self.card_images[card.id]
+        if image is None and card.id not in self._missing_cards:
+            path = card_image_path(card)
+            try:
+                image = self.card_images[card.id] = load_image(path, CARD_SIZE, alpha=True)
+            except (pygame.error, FileNotFoundError):
+                print(f"Error loading: {path}")
+                self._missing_cards.add(card.id)
+        return image
 
     def play_sound(self, sound_key, loop=False, maxtime=0):
         """Play a sound effect"""
@@ -110,3 +279,33 @@ class ResourceManager:
         """Stop a sound effect"""
         if sound_key in self.sounds:
             self.sounds[sound_key].stop()
+
+    def play_music(self, music_key, loop=True, volume=None):
+        """
+        Stream a music track, a missing track or audio device is skipped with a warning
+
+        Args:
+            music_key (str): Key of the track in self.music
+            loop (bool): Repeat the track forever
+            volume (float): Volume in [0, 1], settings.MUSIC_VOLUME if None
+
+        Returns:
+            bool: True if the track is playing
+        """
+        path = self.music.get(music_key)
+        if path is None or not os.path.exists(path):
+            print(f"Music not found: {path or music_key}")
+            return False
+        try:
+            pygame.mixer.music.load(path)
+            pygame.mixer.music.set_volume(settings.MUSIC_VOLUME if volume is None else volume)
+            pygame.mixer.music.play(-1 if loop else 0)
+        except pygame.error as e:
+            print(f"Could not play {path}: {e}")
+            return False
+        return True
+
+    def stop_music(self):
+        """Stop the music track"""
+        if pygame.mixer.get_init():
+            pygame.mixer.music.stop()
@@ -1,6 +1,7 @@
 import pygame
 import os
 from config import settings
+from managers.ResoureManager import load_image
 
 class Slider:
 
@@ -17,7 +18,7 @@ class Slider:
 
         self.handle_img = None
         handle_img_path = os.path.join('assets', 'chip.png')
-        original_img = pygame.image.load(handle_img_path).convert_alpha()
+        original_img = load_image(handle_img_path, alpha=True)
         scaled_img = pygame.transform.smoothscale(original_img, (self.handle_size, self.handle_size))
         self.handle_img = self._crop_to_circle(scaled_img)
         
@@ -67,14 +68,14 @@ class Slider:
     
     def draw(self, surface):
         # Draw track
-        pygame.draw.rect(surface, self.COLOR_TRACK, self.rect)
+        surface.draw_rect(self.COLOR_TRACK, self.rect)
         
         # Draw fill
         fill_rect = pygame.Rect(self.rect.x, self.rect.y, self.handle_x - self.rect.x, self.rect.height)
-        pygame.draw.rect(surface, self.COLOR_FILL, fill_rect)
+        surface.draw_rect(self.COLOR_FILL, fill_rect)
         
         # Draw handle
         surface.blit(self.handle_img, self.handle_rect)
         
         # Draw border
-        # pygame.draw.rect(surface, self.COLOR_BORDER, self.rect, 2)
\ No newline at end of file
+        # surface.draw_rect(self.COLOR_BORDER, self.rect, 2)
\ No newline at end of file
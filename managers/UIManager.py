@@ -1,4 +1,5 @@
 import pygame
+from collections import OrderedDict
 from config import settings
 
 class UIManager:
@@ -14,16 +15,44 @@ class UIManager:
             'BLUE': settings.BLUE,
             'RED': settings.RED
         }
+        # Rendered text surfaces keyed by (text, font, color), least recently used first
+        self.text_cache = OrderedDict()
+        self.text_cache_size = settings.TEXT_CACHE_SIZE
 
     def draw_card(self, card, x, y):
         """Draw a card at specified position"""
-        card_str = str(card)
-        if card_str in self.resource_manager.card_images:
-            self.window.blit(self.resource_manager.card_images[card_str], (x, y))
+        image = self.resource_manager.get_card_image(card)
+        if image is not None:
+            self.window.blit(image, (x, y))
+
+    def draw_image(self, key, x, y):
+        """Draw a loaded image, skipped if it could not be loaded"""
+        image = self.resource_manager.images.get(key)
+        if image is not None:
+            self.window.blit(image, (x, y))
+
+    def render_text(self, text, font, color):
+        """Rendered surface of a text, re-rendered only when not in the cache"""
+        key = (text, font, color)
+        cache = self.text_cache
+        surface = cache.get(key)
+        if surface is not None:
+            cache.move_to_end(key)
+            return surface
+
+        surface = font.render(text, True, color)
+        cache[key] = surface
+        if len(cache) > self.text_cache_size:
+            cache.popitem(last=False)
+        return surface
+
+    def clear_text_cache(self):
+        """Drop every cached text surface, e.g. after fonts are reloaded"""
+        self.text_cache.clear()
 
     def draw_text(self, text, font, color, x, y, center=False):
         """Draw text at specified position"""
-        text_surface = font.render(text, True, color)
+        text_surface = self.render_text(text, font, color)
         if center:
             text_rect = text_surface.get_rect(center=(x, y))
             self.window.blit(text_surface, text_rect)
@@ -38,28 +67,37 @@ class UIManager:
         button_rect = pygame.Rect(x, y, width, height)
         
         if button_rect.collidepoint(mouse):
-            pygame.draw.rect(self.window, hover_color, button_rect, border_radius=10) 
+            self.window.draw_rect(hover_color, button_rect, border_radius=10) 
             if click[0] == 1:
                 self.resource_manager.play_sound('button_click', loop=False)
                 if action:
                     action()
                 return True
         else:
-            pygame.draw.rect(self.window, color, button_rect, border_radius=10)
+            self.window.draw_rect(color, button_rect, border_radius=10)
         
-        pygame.draw.rect(self.window, self.colors['BLACK'], button_rect, 3, border_radius=10)
+        self.window.draw_rect(self.colors['BLACK'], button_rect, 3, border_radius=10)
         self.draw_text(text, self.resource_manager.fonts['primary_small'], self.colors['WHITE'], x + width//2, y + height//2, center=True)
         
         return False
 
+    def draw_progress_bar(self, progress, x, y, width, height):
+        """Draw a progress bar filled to progress (0 to 1)"""
+        self.window.draw_rect(self.colors['GRAY'], (x, y, width, height), border_radius=height // 2)
+        if progress > 0:
+            self.window.draw_rect(self.colors['GOLD'], (x, y, max(height, int(width * progress)), height), border_radius=height // 2)
+        self.window.draw_rect(self.colors['BLACK'], (x, y, width, height), 2, border_radius=height // 2)
+
     def show_tutorial(self):
         viewing_tutorial = True
+        clock = pygame.time.Clock()
         
         while viewing_tutorial:
-            self.window.blit(self.resource_manager.images['tutorial_img'], (0, 0))
+            clock.tick(60)
+            self.draw_image('tutorial_img', 0, 0)
             back_clicked = self.draw_button("Back", 50, 30, 150, 50, self.colors['RED'], self.colors['GRAY'])
             
-            pygame.display.update()
+            self.window.present()
             
             if back_clicked:
                 viewing_tutorial = False
@@ -1,8 +1,29 @@
+from config import settings
+
 class Card:
-   
+
+    __slots__ = ('suit', 'rank', 'id', 'value', 'is_ace', 'is_ten')
+
     def __init__(self, suit:str, rank:str):
         self.suit = suit
         self.rank = rank
-    
+        # Compact encoding: 0-51, in the same rank-major order as Deck
+        self.id = settings.ranks.index(rank) * len(settings.suits) + settings.suits.index(suit)
+        self.value = settings.values[rank]
+        self.is_ace = rank == 'Ace'
+        self.is_ten = rank in settings.ranks[8:12]
+
+    @staticmethod
+    def get(suit:str, rank:str):
+        """Return the shared Card instance for suit and rank"""
+        return CARDS[settings.ranks.index(rank) * len(settings.suits) + settings.suits.index(suit)]
+
     def __str__(self):
-        return f'{self.rank} of {self.suit}'
\ No newline at end of file
+        return f'{self.rank} of {self.suit}'
+
+    def __repr__(self):
+        return f'Card({self.suit!r}, {self.rank!r})'
+
+
+# Interned singletons for all 52 cards, indexed by Card.id
+CARDS = tuple(Card(suit, rank) for rank in settings.ranks for suit in settings.suits)
@@ -1,27 +1,61 @@
 import random
 from config import settings
-from models.Card import Card
+from models.Card import Card, CARDS
+from models.Outcome import MAX_CARDS
+
+# Most cards one round can deal: a full hand each for the player and the dealer
+CARDS_PER_ROUND = 2 * MAX_CARDS
+
+
+class ShoeExhaustedError(Exception):
+    """Raised when a card is dealt from an empty shoe, callers must reshuffle between rounds"""
+    pass
+
 
 class Deck:
+    """
+    Shoe of one or more 52-card decks
+
+    Cards are dealt from a cursor in O(1); shuffling reorders the same list
+    in place and moves the cursor back to the top. Once the cursor passes the
+    cut card (penetration), needs_shuffle() tells the caller to reshuffle.
+    The cut card leaves at least CARDS_PER_ROUND cards behind it, so a round
+    started before it always finishes without reshuffling the cards in play.
+    """
+
+    def __init__(self, num_decks: int = 1, penetration: float = 0.75):
+        if not 1 <= num_decks <= 8:
+            raise ValueError('num_decks must be between 1 and 8')
+        if not 0 < penetration <= 1:
+            raise ValueError('penetration must be in (0, 1]')
+        self.num_decks = num_decks
+        self.cards = list(CARDS) * num_decks
+        self.cursor = 0
+        self.cut_card = min(int(len(self.cards) * penetration), len(self.cards) - CARDS_PER_ROUND)
 
-    def __init__(self):
-        self.cards = []
-        for rank in settings.ranks:
-            for suit in settings.suits:
-                self.cards.append(Card(suit, rank))
-    
     def shuffle(self):
         random.shuffle(self.cards)
+        self.cursor = 0
 
     def fake_shuffle(self):
-        self.cards[0] = Card('Hearts', 'Six')
-        self.cards[2] = Card('Spades', 'Five')
-        self.cards[4] = Card('Clubs', 'Ace')
+        self.cards[self.cursor] = Card.get('Hearts', 'Six')
+        self.cards[self.cursor + 2] = Card.get('Spades', 'Five')
+        self.cards[self.cursor + 4] = Card.get('Clubs', 'Ace')
 
     def deal(self):
-        dealt_card = self.cards.pop(0)
-        self.cards.append(dealt_card)
+        if self.cursor >= len(self.cards):
+            # Reshuffling here would put the cards on the table back in the shoe
+            raise ShoeExhaustedError("No cards left in the shoe, reshuffle between rounds")
+        dealt_card = self.cards[self.cursor]
+        self.cursor += 1
         return dealt_card
-    
+
+    def needs_shuffle(self):
+        """Whether the cut card has been reached"""
+        return self.cursor >= self.cut_card
+
+    def cards_left(self):
+        return len(self.cards) - self.cursor
+
     def __str__(self):
-        return str(self.cards)
+        return str(self.cards[self.cursor:])
@@ -1,55 +1,55 @@
 from config import settings
+from models.Outcome import classify, describe
+
+def hand_value(hard_total, aces, count):
+    """Value of a hand from its running totals (every Ace counted as 1 in hard_total)"""
+    # A single Ace in a hand of less than 4 cards counts as 11, then 10, then 1.
+    # Otherwise every Ace counts as 1.
+    if aces == 1 and count < 4:
+        if hard_total + 10 <= 21:
+            return hard_total + 10
+        if hard_total + 9 <= 21:
+            return hard_total + 9
+    return hard_total
+
 
 class Hand:
-    
+
     def __init__(self):
         self.cards = []
         self.value = 0
-    
+        # Running totals, updated on every add_card
+        self.hard_total = 0      # Every Ace counted as 1
+        self.aces = 0
+        self.count = 0
+        self.usable_ace = False  # True if an Ace counts for more than 1
+
     def add_card(self,card):
         self.cards.append(card)
+        self.hard_total += card.value
+        self.aces += card.is_ace
+        self.count += 1
         self._cal_value()
-        
+
     def num_of_cards(self):
-        return len(self.cards)
-    
+        return self.count
+
+    def outcome(self):
+        """Special case of the hand as an Outcome code"""
+        return classify(self.count, self.hard_total, self.aces)
+
     def special_cases(self):
-        if self.num_of_cards() == 2:
-            first_card, second_card = self.cards[0], self.cards[1]
-            if (first_card.rank in settings.ranks[8:12] and second_card.rank == settings.ranks[-1]) or (second_card.rank in settings.ranks[8:12] and first_card.rank == settings.ranks[-1]):
-                return 'BlackJack'
-            elif first_card.rank == settings.ranks[-1] and second_card.rank == settings.ranks[-1]:
-                return 'DoubleAces'
-        elif self.num_of_cards() == 5 and self.value <= 21:
-            return f'5-Card Charlie ({self.value})'
-        return None
-    
+        """Display string of the special case, None if there is none"""
+        return describe(self.outcome(), self.value)
+
     def _cal_value(self):
-        if len(self.cards) >= 4:
-            self.value = sum(settings.values[card.rank] for card in self.cards)
-        else:
-            total = 0
-            aces = 0
-            
-            for card in self.cards:
-                if card.rank == 'Ace':
-                    aces += 1
-                else:
-                    total += settings.values[card.rank]
-
-            if aces == 0:
-                self.value = total
-            elif aces == 1:
-                if total + 11 <= 21:
-                    self.value = total + 11
-                elif total + 10 <= 21:
-                    self.value = total + 10
-                else:
-                    self.value = total + 1
-            else:
-                self.value = total + aces
-            
-    
+        self.value = hand_value(self.hard_total, self.aces, self.count)
+        self.usable_ace = self.value > self.hard_total
+
     def clear(self):
         self.cards = []
-        self.value = 0
\ No newline at end of file
+        self.value = 0
+        self.hard_total = 0
+        self.aces = 0
+        self.count = 0
+        self.usable_ace = False
@@ -0,0 +1,54 @@
+from enum import IntEnum
+
+
+class Outcome(IntEnum):
+    """Special case of a hand, NONE is falsy"""
+    NONE = 0
+    BLACKJACK = 1
+    DOUBLE_ACES = 2
+    FIVE_CARD_CHARLIE = 3
+
+
+MAX_CARDS = 5
+MAX_HARD_TOTAL = 10 * MAX_CARDS
+
+
+def _classify(count, hard_total, aces):
+    if count == 2:
+        # Ace + a 10-valued card is the only two-card hand with one Ace and a hard total of 11
+        if aces == 1 and hard_total == 11:
+            return Outcome.BLACKJACK
+        if aces == 2:
+            return Outcome.DOUBLE_ACES
+    elif count == MAX_CARDS and hard_total <= 21:
+        # Hands of 4+ cards count every Ace as 1, so the value is the hard total
+        return Outcome.FIVE_CARD_CHARLIE
+    return Outcome.NONE
+
+
+# Precomputed classification, indexed as OUTCOMES[count][hard_total][aces]
+OUTCOMES = tuple(
+    tuple(
+        tuple(_classify(count, hard_total, aces) for aces in range(MAX_CARDS + 1))
+        for hard_total in range(MAX_HARD_TOTAL + 1)
+    )
+    for count in range(MAX_CARDS + 1)
+)
+
+
+def classify(count, hard_total, aces):
+    """Look up the special case of a hand from its running totals"""
+    if count > MAX_CARDS:
+        return Outcome.NONE
+    return OUTCOMES[count][hard_total][aces]
+
+
+def describe(outcome, value):
+    """Display string of a special case, None for Outcome.NONE"""
+    if outcome == Outcome.BLACKJACK:
+        return 'BlackJack'
+    if outcome == Outcome.DOUBLE_ACES:
+        return 'DoubleAces'
+    if outcome == Outcome.FIVE_CARD_CHARLIE:
+        return f'5-Card Charlie ({value})'
+    return None
@@ -0,0 +1,270 @@
+import atexit
+import cProfile
+import functools
+import importlib
+import os
+import time
+
+
+# Environment variable enabling the profiler, see enable_from_option()
+ENV_VAR = 'BLACKJACK_PROFILE'
+
+# Section name -> (module, class, method) of the hot paths that can be timed
+HOOKS = {
+    'BlackjackEnv.reset': ('ai.env', 'BlackjackEnv', 'reset'),
+    'BlackjackEnv.step': ('ai.env', 'BlackjackEnv', 'step'),
+    'BlackjackEnv.dealer_playout': ('ai.env', 'BlackjackEnv', '_play_dealer_and_get_reward'),
+    'QLearningAgent.update': ('ai.agent', 'QLearningAgent', 'update'),
+    'QLearningAgent.act': ('ai.agent', 'QLearningAgent', 'act'),
+    'Game.display_table': ('game.Game', 'Game', 'display_table'),
+    'UIManager.draw_text': ('managers.UIManager', 'UIManager', 'draw_text'),
+    'ResourceManager.load_resources': ('managers.ResoureManager', 'ResourceManager', 'load_resources'),
+}
+
+# Sections used without pygame, e.g. by ai/train.py
+TRAINING_SECTIONS = ('BlackjackEnv.reset', 'BlackjackEnv.step', 'BlackjackEnv.dealer_playout', 'QLearningAgent.update')
+
+# Durations are bucketed by powers of two nanoseconds
+NUM_BUCKETS = 48
+
+
+class SectionStats:
+    """
+    Call count, total/min/max time and a log2 histogram of one section
+    """
+
+    __slots__ = ('name', 'count', 'total', 'min', 'max', 'buckets')
+
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+        self.buckets = [0] * NUM_BUCKETS
+
+    def add(self, elapsed_ns):
+        """Record one call of elapsed_ns nanoseconds"""
+        self.count += 1
+        self.total += elapsed_ns
+        if self.min is None or elapsed_ns < self.min:
+            self.min = elapsed_ns
+        if elapsed_ns > self.max:
+            self.max = elapsed_ns
+        self.buckets[min(elapsed_ns.bit_length(), NUM_BUCKETS - 1)] += 1
+
+    def percentile(self, q):
+        """
+        Approximate percentile from the histogram
+
+        Args:
+            q (float): Percentile in [0, 100]
+
+        Returns:
+            int: Upper bound in nanoseconds of the bucket holding the percentile
+        """
+        if not self.count:
+            return 0
+        target = self.count * q / 100
+        seen = 0
+        for bucket, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= target:
+                return min(1 << bucket, self.max)
+        return self.max
+
+
+class Profiler:
+    """
+    Opt-in timing of named sections
+
+    Nothing is measured until enable() is called: the hooked methods are then
+    replaced on their classes by thin timing wrappers, so a disabled profiler
+    costs nothing. The per-call cost of a wrapper is measured once and
+    subtracted from reported means. Optionally runs cProfile for the whole
+    process and dumps its stats on exit.
+    """
+
+    def __init__(self):
+        self.sections = {}
+        self.enabled = False
+        self.overhead_ns = 0
+        self.cprofile = None
+        self.cprofile_path = None
+        self._originals = {}
+
+    def stats(self, name):
+        """Stats of a section, created on first use"""
+        if name not in self.sections:
+            self.sections[name] = SectionStats(name)
+        return self.sections[name]
+
+    def wrap(self, name, func):
+        """
+        Wrap a function so every call is timed into a section
+
+        Args:
+            name (str): Section name
+            func (callable): Function to time
+
+        Returns:
+            callable: Timing wrapper
+        """
+        add = self.stats(name).add
+        clock = time.perf_counter_ns
+
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                add(clock() - start)
+        return timed
+
+    def section(self, name):
+        """Context manager timing a block of code into a section"""
+        return _Section(self.stats(name).add)
+
+    def enable(self, sections=None, cprofile_path=None, report_at_exit=True):
+        """
+        Install the timing hooks
+
+        Args:
+            sections (iterable): Names from HOOKS to time, all of them if None
+            cprofile_path (str): Also run cProfile and dump its stats here on exit (optional)
+            report_at_exit (bool): Print the report when the process exits
+        """
+        if self.enabled:
+            return
+        self.enabled = True
+        self.overhead_ns = self._calibrate()
+
+        for name in (HOOKS if sections is None else sections):
+            module_name, class_name, method_name = HOOKS[name]
+            cls = getattr(importlib.import_module(module_name), class_name)
+            original = cls.__dict__[method_name]
+            self._originals[name] = (cls, method_name, original)
+            setattr(cls, method_name, self.wrap(name, original))
+
+        if cprofile_path:
+            self.cprofile_path = cprofile_path
+            self.cprofile = cProfile.Profile()
+            self.cprofile.enable()
+
+        if report_at_exit:
+            atexit.register(self._at_exit)
+
+    def disable(self):
+        """Remove the timing hooks and stop cProfile; collected stats are kept"""
+        for cls, method_name, original in self._originals.values():
+            setattr(cls, method_name, original)
+        self._originals.clear()
+        if self.cprofile is not None:
+            self.cprofile.disable()
+        self.enabled = False
+
+    def _calibrate(self, calls=20000):
+        """Per-call cost in nanoseconds of a timing wrapper around an empty function"""
+        def noop():
+            pass
+        stats = SectionStats('calibration')
+        clock = time.perf_counter_ns
+
+        def timed():
+            start = clock()
+            try:
+                return noop()
+            finally:
+                stats.add(clock() - start)
+
+        best = None
+        for _ in range(3):
+            start = clock()
+            for _ in range(calls):
+                timed()
+            wrapped = clock() - start
+            start = clock()
+            for _ in range(calls):
+                noop()
+            bare = clock() - start
+            overhead = max(0, (wrapped - bare) // calls)
+            best = overhead if best is None else min(best, overhead)
+        return best
+
+    def report(self):
+        """
+        Text report of every section, slowest total first
+
+        Returns:
+            str: Report table
+        """
+        lines = [
+            f"Profile (timing overhead ~{self.overhead_ns} ns/call, subtracted from means)",
+            f"{'section':<34}{'calls':>10}{'total ms':>11}{'mean us':>10}{'p50 us':>9}{'p99 us':>9}{'max us':>10}",
+        ]
+        sections = sorted(self.sections.values(), key=lambda s: s.total, reverse=True)
+        for s in sections:
+            if not s.count:
+                continue
+            mean = max(0, s.total / s.count - self.overhead_ns)
+            lines.append(f"{s.name:<34}{s.count:>10,}{s.total / 1e6:>11.1f}{mean / 1e3:>10.2f}"
+                         f"{s.percentile(50) / 1e3:>9.2f}{s.percentile(99) / 1e3:>9.2f}{s.max / 1e3:>10.1f}")
+        return '\n'.join(lines)
+
+    def dump(self):
+        """Print the report and write the cProfile stats if enabled"""
+        print(self.report())
+        if self.cprofile is not None:
+            self.cprofile.disable()
+            os.makedirs(os.path.dirname(self.cprofile_path) or '.', exist_ok=True)
+            self.cprofile.dump_stats(self.cprofile_path)
+            print(f"cProfile stats saved to {self.cprofile_path} (view with python -m pstats)")
+
+    def _at_exit(self):
+        if self.enabled:
+            self.dump()
+
+    def reset(self):
+        """Clear the collected stats"""
+        for s in self.sections.values():
+            s.__init__(s.name)
+
+
+class _Section:
+    __slots__ = ('add', 'start')
+
+    def __init__(self, add):
+        self.add = add
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.add(time.perf_counter_ns() - self.start)
+
+
+# Process-wide profiler used by the entry points
+profiler = Profiler()
+
+
+def enable_from_option(option=None, sections=None):
+    """
+    Enable the profiler from a --profile option, falling back to BLACKJACK_PROFILE
+
+    Args:
+        option (str): None to use the environment variable, ''/'0' to stay disabled,
+            '1' for the section report only, anything else is also used as the
+            cProfile output path (e.g. 'train.prof')
+        sections (iterable): Names from HOOKS to time, all of them if None
+
+    Returns:
+        bool: True if the profiler was enabled
+    """
+    if option is None:
+        option = os.environ.get(ENV_VAR)
+    if not option or option == '0':
+        return False
+    profiler.enable(sections=sections, cprofile_path=None if option == '1' else option)
+    return True